@@ -20,6 +20,13 @@ import shutil
 import yaml
 from datetime import datetime
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is optional; its JSONDecodeError subclasses the stdlib one
+    _json_loads = json.loads
+
 try:
     from .external_tools import ExternalToolRunner
     from ..storage import Storage
@@ -460,7 +467,7 @@ class EnhancedNucleiRunner:
             for line in result['stdout'].split('\n'):
                 if line.strip():
                     try:
-                        finding = json.loads(line)
+                        finding = _json_loads(line)
                         finding['scan_name'] = scan_name
                         finding['timestamp'] = datetime.now().isoformat()
                         findings.append(finding)
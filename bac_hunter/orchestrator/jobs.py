@@ -4,6 +4,11 @@ from contextlib import contextmanager
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 import json
 
+try:
+    from ..storage import enable_wal, tune_connection
+except ImportError:
+    from storage import enable_wal, tune_connection
+
 JOBS_SCHEMA = '''
 CREATE TABLE IF NOT EXISTS jobs(
   id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -29,12 +34,14 @@ class JobStore:
         self._init()
 
     def _init(self):
+        enable_wal(self.path)
         with self.conn() as c:
             c.executescript(JOBS_SCHEMA)
 
     @contextmanager
     def conn(self):
         con = sqlite3.connect(self.path)
+        tune_connection(con)
         try:
             yield con
         finally:
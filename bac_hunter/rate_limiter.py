@@ -1,7 +1,8 @@
 import asyncio
 import time
-from collections import defaultdict
-from typing import Dict
+from collections import defaultdict, deque
+from itertools import groupby, repeat
+from typing import Dict, Iterable
 
 
 class TokenBucket:
@@ -16,31 +17,22 @@ class TokenBucket:
     async def take(self, amount: float = 1.0):
         async with self.lock:
             now = time.perf_counter()
-            elapsed = now - self.updated
+            elapsed = max(0.0, now - self.updated)
             self.updated = now
-            self.tokens = min(self.tokens + elapsed * self.rate, max(self.rate, 10.0))
+            # Refill in one step; never start from a negative balance
+            self.tokens = max(0.0, min(self.tokens + elapsed * self.rate, max(self.rate, 10.0)))
             
-            # Add timeout protection to prevent infinite loops
-            start_time = now
-            while self.tokens < amount:
-                need = amount - self.tokens
-                wait = need / self.rate if self.rate > 0 else 0.5
-                
-                # Check if we've been waiting too long
-                if (time.perf_counter() - start_time) > self.max_wait_time:
-                    # Force token generation to prevent infinite loop
-                    self.tokens = max(amount, self.rate)
-                    break
-                
-                await asyncio.sleep(min(0.5, wait))
-                now2 = time.perf_counter()
-                gained = (now2 - self.updated) * self.rate
-                self.tokens += gained
-                self.updated = now2
-                
-                # Additional safety check
-                if self.tokens < 0:
-                    self.tokens = 0
+            deficit = amount - self.tokens
+            if deficit > 0:
+                # Sleep once for exactly the time needed, capped by max_wait_time
+                wait = deficit / self.rate if self.rate > 0 else self.max_wait_time
+                await asyncio.sleep(min(wait, self.max_wait_time))
+                now = time.perf_counter()
+                self.tokens += max(0.0, now - self.updated) * self.rate
+                self.updated = now
+                if self.tokens < amount:
+                    # Timeout protection: grant the tokens rather than wait again
+                    self.tokens = amount
                     
             self.tokens -= amount
 
@@ -70,7 +62,10 @@ class AdaptiveRateLimiter(RateLimiter):
         self._last_update = 0.0
         # Enhanced adaptive features
         self._waf_detector = None
-        self._host_health = defaultdict(lambda: {"blocks": 0, "last_block": 0, "success_streak": 0})
+        # "blocks" decays with sustained success; "block_ts" holds the timestamps
+        # of blocks seen within the last _block_window seconds
+        self._host_health = defaultdict(lambda: {"blocks": 0, "last_block": 0, "success_streak": 0, "block_ts": deque()})
+        self._block_window = 60.0
         self._emergency_throttle = {}
         # Add circuit breaker to prevent infinite backoff
         self._circuit_breaker_threshold = 5
@@ -80,30 +75,74 @@ class AdaptiveRateLimiter(RateLimiter):
         """Attach WAF detector for intelligent rate adaptation."""
         self._waf_detector = waf_detector
         
-    def report_response(self, host: str, status_code: int, headers: dict = None):
-        """Report response for adaptive learning."""
+    def report_response(self, host: str, status_code: int, headers: dict = None, *, count: int = 1):
+        """Report response for adaptive learning.
+        
+        ``count`` reports the same status several times in one update.
+        """
+        if count < 1:
+            return
         now = time.perf_counter()
         health = self._host_health[host]
         
         # Track blocks and success streaks
-        if status_code in [403, 406, 429, 503]:
-            health["blocks"] += 1
-            health["last_block"] = now
-            health["success_streak"] = 0
+        kind = self._classify_status(status_code)
+        if kind == "block":
+            self._record_blocks(host, health, count, now)
+        elif kind == "success":
+            self._record_successes(health, count)
             
-            # Trigger emergency throttle with circuit breaker protection
-            if health["blocks"] >= 3 and health["blocks"] < self._circuit_breaker_threshold:
-                emergency_duration = min(300, health["blocks"] * 30)  # Max 5 minutes
-                self._emergency_throttle[host] = now + emergency_duration
-            elif health["blocks"] >= self._circuit_breaker_threshold:
-                # Circuit breaker: stop all requests for this host temporarily (short window for tests)
-                self._emergency_throttle[host] = now + 1  # 1 second window
+    def report_responses(self, host: str, status_codes: Iterable[int]):
+        """Report a burst of responses for one host in a single update.
+        
+        Equivalent to calling report_response for each status in order, but
+        consecutive runs of blocks or successes are applied in one step.
+        """
+        now = time.perf_counter()
+        health = self._host_health[host]
+        for kind, run in groupby(status_codes, key=self._classify_status):
+            count = sum(1 for _ in run)
+            if kind == "block":
+                self._record_blocks(host, health, count, now)
+            elif kind == "success":
+                self._record_successes(health, count)
                 
-        elif 200 <= status_code < 300:
-            health["success_streak"] += 1
-            # Reset blocks after sustained success
-            if health["success_streak"] >= 10:
-                health["blocks"] = max(0, health["blocks"] - 1)
+    @staticmethod
+    def _classify_status(status_code: int) -> str:
+        if status_code in [403, 406, 429, 503]:
+            return "block"
+        if 200 <= status_code < 300:
+            return "success"
+        return "other"
+        
+    def _record_blocks(self, host: str, health: dict, count: int, now: float):
+        health["blocks"] += count
+        health["last_block"] = now
+        health["success_streak"] = 0
+        
+        # Rolling window of recent blocks: append, then expire the head
+        block_ts = health.setdefault("block_ts", deque())
+        block_ts.extend(repeat(now, count))
+        while block_ts and now - block_ts[0] > self._block_window:
+            block_ts.popleft()
+        recent = len(block_ts)
+        
+        # Trigger emergency throttle with circuit breaker protection
+        if recent >= 3 and recent < self._circuit_breaker_threshold:
+            emergency_duration = min(300, recent * 30)  # Max 5 minutes
+            self._emergency_throttle[host] = now + emergency_duration
+        elif recent >= self._circuit_breaker_threshold:
+            # Circuit breaker: stop all requests for this host temporarily (short window for tests)
+            self._emergency_throttle[host] = now + 1  # 1 second window
+            
+    def _record_successes(self, health: dict, count: int):
+        streak = health["success_streak"]
+        health["success_streak"] = streak + count
+        # Reset blocks after sustained success: every success that brings the
+        # streak to 10 or more forgives one block
+        forgiven = max(0, streak + count - max(streak, 9))
+        if forgiven:
+            health["blocks"] = max(0, health["blocks"] - forgiven)
                 
     def _calculate_adaptive_delay(self, host: str) -> float:
         """Calculate intelligent delay based on host health and WAF detection."""
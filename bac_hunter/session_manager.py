@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Optional, List, Tuple, Callable
+from typing import Dict, Optional, List, Set, Tuple, Callable
 try:
     from .config import Identity
     from .utils import pick_ua
@@ -7,14 +7,87 @@ except Exception:
     from config import Identity
     from utils import pick_ua
 
+import asyncio
+import concurrent.futures
+import importlib.util
 import logging
+import random
 import re
 import json
 import os
+import tempfile
+import threading
+from enum import Enum
 from urllib.parse import urlparse
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; session files fall back to the stdlib json module
+    orjson = None
+
 log = logging.getLogger("session")
 
+# Login failures that retrying cannot fix (missing browser stack, denied access)
+NON_RETRYABLE = (ImportError, PermissionError)
+# HTTP statuses worth another login attempt when carried by a login error
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class LoginFailure(str):
+    """Non-retryable open_browser_login outcome.
+
+    Falsy, so callers that treat the result as a bool still see a failed login,
+    while aensure_logged_in can tell it apart from a plain ``False`` and stop
+    retrying.
+    """
+
+    def __bool__(self) -> bool:
+        return False
+
+
+# open_browser_login results that retrying cannot change
+AUTH_FAILED = LoginFailure("auth_failed")              # credentials/access rejected
+LOGIN_UNAVAILABLE = LoginFailure("login_unavailable")  # browser automation not installed
+# Cookie expiry values that mark a session cookie (never expires on its own)
+_SESSION_COOKIE_EXPIRY = frozenset({None, 0, "0", ""})
+
+
+class _CBState(Enum):
+    """Per-domain login circuit breaker state."""
+    CLOSED = "closed"        # counting failures, logins allowed
+    OPEN = "open"            # backoff active, fail fast
+    HALF_OPEN = "half_open"  # backoff expired, a single probe login allowed
+
+
+def _read_json(path: str):
+    """Load a session JSON file (orjson when available)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, obj) -> None:
+    """Write a session JSON file, indented for readability (orjson when available)."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+
+
+def _is_retryable_login_error(exc: BaseException) -> bool:
+    """Only network/timeout/transient errors are worth another browser login."""
+    if isinstance(exc, NON_RETRYABLE):
+        return False
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS
+    return isinstance(exc, (TimeoutError, asyncio.TimeoutError, ConnectionError, OSError))
+
 
 class SessionManager:
     """Lightweight identity registry for low-noise differential testing later.
@@ -34,6 +107,10 @@ class SessionManager:
         # Aggregate index path for convenience (optional)
         self._aggregate_path: Optional[str] = None
         self._sessions_dir: Optional[str] = None
+        # Safe domain names that have a session file, listed lazily once
+        self._domain_index: Optional[Set[str]] = None
+        # Guards _domain_index and session.json writes (browser-login threads, threadpool handlers)
+        self._aggregate_lock = threading.Lock()
         # Interactive login configuration
         self._browser_driver: str = "playwright"
         self._login_timeout_seconds: int = 180
@@ -41,6 +118,12 @@ class SessionManager:
         # Retry and overall timeout guards to prevent infinite loops
         self._max_login_retries: int = 3
         self._overall_login_timeout_seconds: int = 240
+        # Linear, capped retry backoff (full jitter is applied on top)
+        self._base_backoff_ms: int = 500
+        self._max_backoff_ms: int = 2000
+        # Bulkhead: cap concurrently open login browsers (each is a full Chromium)
+        self._max_concurrent_logins: int = 3
+        self._browser_sem = threading.BoundedSemaphore(self._max_concurrent_logins)
         # Common login path hints for redirect detection
         self._login_path_re = re.compile(r"/(login|signin|sign-in|account|user/login|users/sign_in|auth|session|sso)\b", re.IGNORECASE)
         # Optional extractors for custom apps to provide tokens
@@ -48,6 +131,11 @@ class SessionManager:
         # Internal clock helper
         import time as _t  # lazy to avoid global import noise
         self._now = _t.time
+        # Monotonic clock for login deadlines (_now stays wall-clock for expiry/backoff)
+        self._clock = _t.monotonic
+        # Short-lived has_valid_session results: domain -> (checked_at, valid)
+        self._valid_cache: Dict[str, Tuple[float, bool]] = {}
+        self._valid_cache_ttl: float = 5.0
         # Global auth store path (auth_data.json via env in module)
         try:
             from .auth_store import DEFAULT_AUTH_PATH as _ap
@@ -55,9 +143,10 @@ class SessionManager:
         except Exception:
             self._auth_store_path = "auth_data.json"
 
-    def configure(self, *, sessions_dir: str, browser_driver: Optional[str] = None, login_timeout_seconds: Optional[int] = None, enable_semi_auto_login: Optional[bool] = None, max_login_retries: Optional[int] = None, overall_login_timeout_seconds: Optional[int] = None):
+    def configure(self, *, sessions_dir: str, browser_driver: Optional[str] = None, login_timeout_seconds: Optional[int] = None, enable_semi_auto_login: Optional[bool] = None, max_login_retries: Optional[int] = None, overall_login_timeout_seconds: Optional[int] = None, max_backoff_ms: Optional[int] = None, max_concurrent_logins: Optional[int] = None):
         import os
         self._sessions_dir = sessions_dir
+        self._domain_index = None
         try:
             os.makedirs(self._sessions_dir, exist_ok=True)
         except Exception:
@@ -83,6 +172,17 @@ class SessionManager:
                 self._overall_login_timeout_seconds = max(1, int(overall_login_timeout_seconds))
             except Exception:
                 pass
+        if max_backoff_ms is not None:
+            try:
+                self._max_backoff_ms = max(0, int(max_backoff_ms))
+            except Exception:
+                pass
+        if max_concurrent_logins is not None:
+            try:
+                self._max_concurrent_logins = max(1, int(max_concurrent_logins))
+                self._browser_sem = threading.BoundedSemaphore(self._max_concurrent_logins)
+            except Exception:
+                pass
         # CI/offline guard: disable interactive login when BH_OFFLINE=1
         try:
             if (os.getenv("BH_OFFLINE", "0") == "1"):
@@ -266,14 +366,13 @@ class SessionManager:
             if self._sessions_dir:
                 session_file = self._session_path(domain) or f"{self._sessions_dir}/{domain}.json"
                 if os.path.exists(session_file):
-                    with open(session_file, "r", encoding="utf-8") as f:
-                        data = json.load(f) or {}
-                        # Ensure we have the expected structure
-                        if not isinstance(data.get("cookies"), list):
-                            data["cookies"] = []
-                        # Scope cookies strictly to this domain
-                        data["cookies"] = self._filter_cookies_for_domain(domain, data.get("cookies") or [])
-                        return data
+                    data = _read_json(session_file) or {}
+                    # Ensure we have the expected structure
+                    if not isinstance(data.get("cookies"), list):
+                        data["cookies"] = []
+                    # Scope cookies strictly to this domain
+                    data["cookies"] = self._filter_cookies_for_domain(domain, data.get("cookies") or [])
+                    return data
         except Exception:
             pass
         
@@ -284,7 +383,8 @@ class SessionManager:
         if not domain:
             return
         
-        # Update in-memory cache
+        # Update in-memory cache; validity of every domain may change (global store)
+        self._valid_cache.clear()
         filtered_cookies = self._filter_cookies_for_domain(domain, cookies or [])
         self._domain_sessions[domain] = {
             "cookies": filtered_cookies,
@@ -326,31 +426,70 @@ class SessionManager:
             if self._sessions_dir:
                 session_file = self._session_path(domain) or f"{self._sessions_dir}/{domain}.json"
                 os.makedirs(os.path.dirname(session_file), exist_ok=True)
-                with open(session_file, "w", encoding="utf-8") as f:
-                    json.dump(self._domain_sessions[domain], f, indent=2)
+                _write_json(session_file, self._domain_sessions[domain])
         except Exception:
             pass
         
         # Update aggregate sessions/session.json (for debugging and reuse)
         try:
             if self._aggregate_path and self._sessions_dir:
-                aggregate: Dict[str, object] = {}
-                for fname in os.listdir(self._sessions_dir):
-                    if not fname.endswith(".json"):
-                        continue
-                    if fname == self._aggregate_path.split("/")[-1]:
-                        continue
-                    dom = fname[:-5]
-                    try:
-                        with open(f"{self._sessions_dir}/{fname}", "r", encoding="utf-8") as sf:
-                            aggregate[dom] = json.load(sf)
-                    except Exception:
-                        continue
-                with open(self._aggregate_path, "w", encoding="utf-8") as af:
-                    json.dump(aggregate, af, indent=2)
+                with self._aggregate_lock:
+                    names = self._load_domain_index()
+                    if names is not None:
+                        safe = domain.lower().replace(":", "_")
+                        names.add(safe)
+                        self._write_aggregate(self._read_aggregate(names, safe, self._domain_sessions[domain]))
         except Exception:
             pass
 
+    def _write_aggregate(self, aggregate: Dict[str, object]) -> None:
+        """Atomically replace session.json via a unique temp file (caller holds _aggregate_lock)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self._sessions_dir, prefix=".session.", suffix=".tmp")
+        os.close(fd)
+        try:
+            _write_json(tmp_path, aggregate)
+            os.replace(tmp_path, self._aggregate_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _load_domain_index(self) -> Optional[Set[str]]:
+        """Return the set of domains with a session file, listing the sessions directory only once.
+
+        Callers hold _aggregate_lock. Returns None (and retries on the next save) when the directory cannot be listed.
+        """
+        if self._domain_index is not None:
+            return self._domain_index
+        try:
+            fnames = os.listdir(self._sessions_dir)
+        except OSError:
+            return None
+        skip = self._aggregate_path.split("/")[-1] if self._aggregate_path else None
+        self._domain_index = {f[:-5] for f in fnames if f.endswith(".json") and f != skip}
+        return self._domain_index
+
+    def _read_aggregate(self, names: Set[str], safe: str, session: Dict[str, object]) -> Dict[str, object]:
+        """Build the aggregate from the current per-domain files, with `session` for the domain just saved.
+
+        Files are re-read so sessions written by other processes or instances are never overwritten
+        with stale copies; names whose file has gone are dropped from the index.
+        """
+        aggregate: Dict[str, object] = {}
+        for name in sorted(names):
+            if name == safe:
+                aggregate[name] = session
+                continue
+            try:
+                aggregate[name] = _read_json(f"{self._sessions_dir}/{name}.json")
+            except FileNotFoundError:
+                names.discard(name)
+            except Exception:
+                continue
+        return aggregate
+
     def build_domain_headers(self, domain: str, base_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         sess = self.load_domain_session(domain)
         h: Dict[str, str] = {}
@@ -388,13 +527,18 @@ class SessionManager:
             exp = cookie.get("expires")
             if exp is None:
                 exp = cookie.get("expiry")
-            if exp in (None, 0, "0", ""):
+            if exp in _SESSION_COOKIE_EXPIRY:
                 return True
+            # Type dispatch avoids raising/catching for the common numeric shapes
+            kind = type(exp)
+            if kind is int or kind is float:
+                return exp > self._now()
+            if kind is str and exp.isdigit():
+                return int(exp) > self._now()
             try:
-                expf = float(exp)
-            except Exception:
+                return float(exp) > self._now()
+            except (TypeError, ValueError):
                 return True
-            return expf > self._now()
         except Exception:
             return True
 
@@ -555,7 +699,22 @@ class SessionManager:
 
     # ---- Interactive pre-login helpers ----
     def has_valid_session(self, domain_or_url: str) -> bool:
-        """Check if we have any non-expired cookie or a bearer token for the domain."""
+        """Check if we have any non-expired cookie or a bearer token for the domain.
+
+        Results are cached for a few seconds; saving or clearing sessions drops the cache.
+        """
+        key = domain_or_url
+        if "://" in domain_or_url:
+            key = self._hostname_from_url(domain_or_url) or domain_or_url
+        now = self._clock()
+        hit = self._valid_cache.get(key)
+        if hit is not None and now - hit[0] < self._valid_cache_ttl:
+            return hit[1]
+        valid = self._check_valid_session(domain_or_url)
+        self._valid_cache[key] = (now, valid)
+        return valid
+
+    def _check_valid_session(self, domain_or_url: str) -> bool:
         # ALWAYS check global auth store first
         try:
             from .auth_store import read_auth, is_auth_still_valid, has_auth_data
@@ -629,18 +788,122 @@ class SessionManager:
         
         return False
 
-    def ensure_logged_in(self, domain_or_url: str) -> bool:
-        """Ensure user has logged in for the given domain. Triggers browser if needed.
-        Returns True if a valid session exists after this call.
-        
-        Enhanced with circuit breaker pattern and intelligent backoff.
+    def _compute_backoff(self, attempt: int) -> float:
+        """Delay in seconds before retry `attempt`: full jitter over a linear, capped schedule."""
+        cap_ms = min(self._base_backoff_ms * (attempt + 1), self._max_backoff_ms)
+        return random.uniform(0, cap_ms) / 1000.0
+
+    async def _aopen_browser_login(self, domain_or_url: str):
+        """Run open_browser_login on a worker thread, bounded by the browser bulkhead.
+
+        The bulkhead is a thread semaphore rather than an asyncio one: every
+        ensure_logged_in call may run on its own loop, and waiting for a slot in
+        the worker thread keeps the event loop free.
+
+        Cancelling the await (e.g. the wait_for deadline in aensure_logged_in)
+        cannot stop a browser login that has already started: that thread runs
+        until open_browser_login returns (bounded by login_timeout_seconds) and
+        holds its bulkhead slot until then. A call cancelled while still waiting
+        for a slot gives up without opening a browser.
         """
-        # Always ensure breaker maps exist even when semi-auto login disabled
+        abandoned = threading.Event()
+
+        def _bounded():
+            with self._browser_sem:
+                if abandoned.is_set():
+                    return False
+                return self.open_browser_login(domain_or_url)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, _bounded)
+        except asyncio.CancelledError:
+            abandoned.set()
+            raise
+
+    def _login_breaker_state(self, domain: str, now: float) -> _CBState:
+        """Derive the breaker state from the backoff map (absent means CLOSED)."""
+        until = self._login_backoff_until.get(domain)
+        if until is None:
+            return _CBState.CLOSED
+        return _CBState.OPEN if now < until else _CBState.HALF_OPEN
+
+    def _open_login_breaker(self, domain: str, failures: int, now: float, *, quiet: bool = False) -> None:
+        """Transition to OPEN: back off 1min, 5min, 15min, then 30min."""
+        backoff_minutes = min(30, [1, 5, 15, 30][min(max(failures, 3) - 3, 3)])
+        self._login_backoff_until[domain] = now + (backoff_minutes * 60)
+        if quiet:
+            return
+        try:
+            log.error(f"[{domain}] Circuit breaker activated after {failures} failures. Backoff: {backoff_minutes}min")
+            print(f"🔴 [{domain}] Too many login failures ({failures}). Backing off for {backoff_minutes} minutes")
+        except Exception:
+            pass
+
+    def _close_login_breaker(self, domain: str) -> None:
+        """Transition to CLOSED: forget failures, backoff and any pending probe."""
+        self._login_circuit_breaker.pop(domain, None)
+        self._login_backoff_until.pop(domain, None)
+        if hasattr(self, '_login_probing'):
+            self._login_probing.discard(domain)
+
+    def _trip_login_breaker(self, domain: str, failures: int, reason: object) -> None:
+        """Record a permanent login failure so the next call goes straight to backoff."""
+        self._login_circuit_breaker[domain] = max(failures, 3)
+        try:
+            log.error(f"[{domain}] Non-retryable login failure: {reason}")
+        except Exception:
+            pass
+
+    def _run_sync(self, coro):
+        """Drive a coroutine to completion from synchronous code.
+
+        Uses asyncio.run when no loop is running; otherwise offloads to a helper
+        thread with its own loop (same approach as open_browser_login).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    def ensure_logged_in(self, domain_or_url: str) -> bool:
+        """Synchronous wrapper around aensure_logged_in for existing callers."""
+        # Offline/CI: answer before spinning up an event loop or touching disk
+        if not self._enable_semi_auto_login:
+            return self._offline_login(domain_or_url)
+        return self._run_sync(self.aensure_logged_in(domain_or_url))
+
+    def _init_login_state(self) -> None:
         if not hasattr(self, '_login_circuit_breaker'):
             self._login_circuit_breaker = {}
         if not hasattr(self, '_login_backoff_until'):
             self._login_backoff_until = {}
-        # If tests patched open_browser_login, honor it regardless of interactive setting
+        if not hasattr(self, '_login_probing'):
+            self._login_probing = set()
+
+    def _offline_login(self, domain_or_url: str) -> bool:
+        """Interactive login disabled: no I/O, but still track failures/backoff for visibility."""
+        self._init_login_state()
+        dom = self._hostname_from_url(domain_or_url) or domain_or_url
+        fails = self._login_circuit_breaker.get(dom, 0) + 1
+        self._login_circuit_breaker[dom] = fails
+        if fails >= 3:
+            self._open_login_breaker(dom, fails, self._now(), quiet=True)
+        return False
+
+    async def aensure_logged_in(self, domain_or_url: str) -> bool:
+        """Ensure user has logged in for the given domain. Triggers browser if needed.
+        Returns True if a valid session exists after this call.
+        
+        Enhanced with circuit breaker pattern and intelligent backoff. Delays
+        between retries yield to the event loop instead of blocking it.
+        """
+        # Short-circuit when interactive login disabled, before any I/O
+        if not self._enable_semi_auto_login:
+            return self._offline_login(domain_or_url)
+        self._init_login_state()
+        # If tests patched open_browser_login, honor it
         try:
             from unittest.mock import Mock, MagicMock  # type: ignore
             _obl = getattr(self, 'open_browser_login', None)
@@ -648,173 +911,161 @@ class SessionManager:
                 ok = bool(_obl(domain_or_url))
                 if ok:
                     # Successful mocked login
-                    self._login_circuit_breaker.pop(self._hostname_from_url(domain_or_url) or domain_or_url, None)
-                    self._login_backoff_until.pop(self._hostname_from_url(domain_or_url) or domain_or_url, None)
+                    self._close_login_breaker(self._hostname_from_url(domain_or_url) or domain_or_url)
                     return True
         except Exception:
             pass
-        # Short-circuit when interactive login disabled, but still track failures/backoff
-        if not self._enable_semi_auto_login:
-            dom = self._hostname_from_url(domain_or_url) or domain_or_url
-            # Increment failure count and possibly activate backoff for visibility
-            fails = self._login_circuit_breaker.get(dom, 0) + 1
-            self._login_circuit_breaker[dom] = fails
-            if fails >= 3:
-                backoff_minutes = min(30, [1, 5, 15, 30][min(fails - 3, 3)])
-                self._login_backoff_until[dom] = self._now() + (backoff_minutes * 60)
-            return False
         
         domain = self._hostname_from_url(domain_or_url) or domain_or_url
-        
-        # Initialize circuit breaker tracking
-        if not hasattr(self, '_login_circuit_breaker'):
-            self._login_circuit_breaker = {}
-        if not hasattr(self, '_login_backoff_until'):
-            self._login_backoff_until = {}
-            
         current_time = self._now()
+        state = self._login_breaker_state(domain, current_time)
         
-        # Check if domain is in backoff period
-        if domain in self._login_backoff_until:
-            backoff_until = self._login_backoff_until[domain]
-            if current_time < backoff_until:
-                remaining = int(backoff_until - current_time)
-                try:
-                    log.warning(f"[{domain}] Login backoff active. {remaining}s remaining")
-                    print(f"⏳ [{domain}] Login backoff active. {remaining}s remaining")
-                except Exception:
-                    pass
-                # Allow fast path if a valid session exists despite backoff
-                try:
-                    if self.has_valid_session(domain_or_url):
-                        self._login_circuit_breaker.pop(domain, None)
-                        self._login_backoff_until.pop(domain, None)
-                        return True
-                except Exception:
-                    pass
-                return False
+        # A probe is already running for this domain: behave as OPEN
+        if state is _CBState.HALF_OPEN and domain in self._login_probing:
+            state = _CBState.OPEN
         
-        # Check if we already have a valid session
+        if state is _CBState.OPEN:
+            remaining = int(self._login_backoff_until.get(domain, current_time) - current_time)
+            try:
+                log.warning(f"[{domain}] Login backoff active. {remaining}s remaining")
+                print(f"⏳ [{domain}] Login backoff active. {remaining}s remaining")
+            except Exception:
+                pass
+            # Fail fast without touching the session files
+            return False
+        
+        # HALF_OPEN or CLOSED: reuse a valid session before probing or logging in
         if self.has_valid_session(domain_or_url):
             try:
                 print(f"✅ Reusing existing session for {domain}")
                 # Reset circuit breaker on successful validation
-                self._login_circuit_breaker.pop(domain, None)
-                self._login_backoff_until.pop(domain, None)
+                self._close_login_breaker(domain)
             except Exception:
                 pass
             return True
         
         # Check circuit breaker state
         failures = self._login_circuit_breaker.get(domain, 0)
-        if failures >= 3:
-            # Exponential backoff: 1min, 5min, 15min, 30min
-            backoff_minutes = min(30, [1, 5, 15, 30][min(failures - 3, 3)])
-            self._login_backoff_until[domain] = current_time + (backoff_minutes * 60)
-            try:
-                log.error(f"[{domain}] Circuit breaker activated after {failures} failures. Backoff: {backoff_minutes}min")
-                print(f"🔴 [{domain}] Too many login failures ({failures}). Backing off for {backoff_minutes} minutes")
-            except Exception:
-                pass
+        if state is _CBState.CLOSED and failures >= 3:
+            self._open_login_breaker(domain, failures, current_time)
             return False
         
-        # Bounded retries with overall timeout to avoid infinite loops
+        # Bounded retries under a single overall deadline to avoid infinite loops
         attempts = 0
-        # Define a soft deadline to reduce dependence on multiple _now() calls for testing
-        start_now = self._now()
-        deadline = start_now + max(self._login_timeout_seconds, self._overall_login_timeout_seconds)
+        deadline = self._clock() + max(self._login_timeout_seconds, self._overall_login_timeout_seconds)
         
         # Add maximum attempts cap to prevent infinite loops
         max_attempts = min(self._max_login_retries, 3)  # Cap at 3 attempts
-        
-        # Use a local time cursor to minimize repeated _now() calls (helps tests with limited side_effect values)
-        now_val = start_now
-        have_session = False
-        while (attempts < max_attempts) and (now_val < deadline) and (not have_session):
-            attempts += 1
+        if state is _CBState.HALF_OPEN:
+            # Backoff expired: admit exactly one probe login
+            max_attempts = min(max_attempts, 1)
+            self._login_probing.add(domain)
             try:
-                print(f"🔐 Attempt {attempts}/{max_attempts}: Opening browser for login to {domain}...")
+                print(f"🟡 [{domain}] Backoff expired. Probing login once...")
             except Exception:
                 pass
-            
-            # Add progressive delay between attempts
-            if attempts > 1:
-                delay = min(30, attempts * 5)  # 5s, 10s, 15s, etc., max 30s
+        
+        try:
+            have_session = False
+            while (attempts < max_attempts) and (not have_session):
+                if self._clock() >= deadline:
+                    try:
+                        print(f"⏰ Login deadline exceeded for {domain}. Stopping retries.")
+                    except Exception:
+                        pass
+                    break
+                attempts += 1
                 try:
-                    print(f"⏱️  Waiting {delay}s before retry...")
-                    import time
-                    time.sleep(delay)
+                    print(f"🔐 Attempt {attempts}/{max_attempts}: Opening browser for login to {domain}...")
                 except Exception:
                     pass
             
-            ok = self.open_browser_login(domain_or_url)
+                # Add jittered, capped delay between attempts
+                if attempts > 1:
+                    delay = self._compute_backoff(attempts - 1)
+                    try:
+                        print(f"⏱️  Waiting {delay:.2f}s before retry...")
+                    except Exception:
+                        pass
+                    await asyncio.sleep(min(delay, max(0.0, deadline - self._clock())))
+                    if self._clock() >= deadline:
+                        try:
+                            print(f"⏰ Login deadline exceeded for {domain}. Stopping retries.")
+                        except Exception:
+                            pass
+                        break
             
-            # Check if login was successful
-            if ok:
-                have_session = True
-            else:
+                # Browser login blocks on user interaction; keep it off the loop thread
                 try:
-                    have_session = bool(self.has_valid_session(domain_or_url))
-                except Exception:
-                    have_session = False
+                    ok = await asyncio.wait_for(self._aopen_browser_login(domain_or_url), timeout=deadline - self._clock())
+                except Exception as e:
+                    if not _is_retryable_login_error(e):
+                        self._trip_login_breaker(domain, failures + attempts, e)
+                        break
+                    ok = False
+                if isinstance(ok, LoginFailure):
+                    self._trip_login_breaker(domain, failures + attempts, ok)
+                    break
+            
+                # Check if login was successful
+                if ok:
+                    have_session = True
+                else:
+                    try:
+                        have_session = bool(self.has_valid_session(domain_or_url))
+                    except Exception:
+                        have_session = False
+                if have_session:
+                    try:
+                        print(f"✅ Login successful! Session saved for {domain}")
+                        # Reset circuit breaker on success
+                        self._close_login_breaker(domain)
+                    except Exception:
+                        pass
+                    return True
+            
+                # Track failed attempt only when not successful
+                self._login_circuit_breaker[domain] = failures + attempts
+            
+                # Provide feedback after failed attempt
+                if not ok:
+                    try:
+                        remaining = max(0, int(deadline - self._clock()))
+                        print(f"⚠️  Login attempt {attempts} failed. {remaining}s left; will retry if attempts remain...")
+                    except Exception:
+                        pass
+        
+            # Final check after all attempts
+            try:
+                have_session = bool(self.has_valid_session(domain_or_url))
+            except Exception:
+                have_session = False
             if have_session:
                 try:
-                    print(f"✅ Login successful! Session saved for {domain}")
+                    print(f"✅ Session validated for {domain}")
                     # Reset circuit breaker on success
-                    self._login_circuit_breaker.pop(domain, None)
-                    self._login_backoff_until.pop(domain, None)
+                    self._close_login_breaker(domain)
                 except Exception:
                     pass
                 return True
-            
-            # Track failed attempt only when not successful
-            self._login_circuit_breaker[domain] = failures + attempts
-            
-            # Provide feedback after failed attempt
-            if not ok:
-                try:
-                    remaining = max(0, int(deadline - now_val))
-                    print(f"⚠️  Login attempt {attempts} failed. {remaining}s left; will retry if attempts remain...")
-                except Exception:
-                    pass
-            
-            # Check if we've exceeded the deadline
-            # Advance local clock slightly to simulate time progress in tests
-            try:
-                now_val = self._now()
-            except Exception:
-                now_val += 5.0
-            if now_val >= deadline:
+            else:
+                # Record failure for circuit breaker (never below a tripped breaker)
+                self._login_circuit_breaker[domain] = max(self._login_circuit_breaker.get(domain, 0), failures + attempts)
+                if state is _CBState.HALF_OPEN:
+                    # Failed probe: straight back to OPEN with the next backoff step
+                    self._login_probing.discard(domain)
+                    self._open_login_breaker(domain, self._login_circuit_breaker[domain], current_time)
                 try:
-                    print(f"⏰ Login deadline exceeded for {domain}. Stopping retries.")
+                    total_failures = self._login_circuit_breaker[domain]
+                    print(f"❌ Failed to establish valid session for {domain} after {attempts} attempts (total failures: {total_failures})")
+                    log.error(f"[{domain}] Login failed after {attempts} attempts. Total failures: {total_failures}")
                 except Exception:
                     pass
-                break
-        
-        # Final check after all attempts
-        try:
-            have_session = bool(self.has_valid_session(domain_or_url))
-        except Exception:
-            have_session = False
-        if have_session:
-            try:
-                print(f"✅ Session validated for {domain}")
-                # Reset circuit breaker on success
-                self._login_circuit_breaker.pop(domain, None)
-                self._login_backoff_until.pop(domain, None)
-            except Exception:
-                pass
-            return True
-        else:
-            # Record failure for circuit breaker
-            self._login_circuit_breaker[domain] = failures + attempts
-            try:
-                total_failures = self._login_circuit_breaker[domain]
-                print(f"❌ Failed to establish valid session for {domain} after {attempts} attempts (total failures: {total_failures})")
-                log.error(f"[{domain}] Login failed after {attempts} attempts. Total failures: {total_failures}")
-            except Exception:
-                pass
-            return False
+                return False
+        finally:
+            # Free the probe slot even if the probe raised or was cancelled
+            if state is _CBState.HALF_OPEN:
+                self._login_probing.discard(domain)
 
     def prelogin_targets(self, targets: List[str]):
         """Open a browser for each unique domain to let the user log in once per run.
@@ -823,7 +1074,19 @@ class SessionManager:
         # Respect offline/CI guard
         if not self._enable_semi_auto_login:
             return
+        self._run_sync(self.aprelogin_targets(targets))
+
+    async def aprelogin_targets(self, targets: List[str]) -> list:
+        """Log in to all unique target domains concurrently.
+
+        Backoff windows of different domains overlap, so wall time tracks the
+        slowest domain rather than the sum; browser launches stay capped by the
+        login bulkhead. Per-domain errors are returned, not raised.
+        """
+        if not self._enable_semi_auto_login:
+            return []
         # Deduplicate by hostname
+        domains: list[str] = []
         seen: set[str] = set()
         for t in targets or []:
             try:
@@ -833,54 +1096,15 @@ class SessionManager:
             if not dom or dom in seen:
                 continue
             seen.add(dom)
-            try:
-                # Ensure breaker maps exist for tests
-                if not hasattr(self, '_login_circuit_breaker'):
-                    self._login_circuit_breaker = {}
-                # Only open browser when session missing/expired
-                if not self.has_valid_session(dom):
-                    try:
-                        print(f"🔐 [{dom}] Login required. Starting browser...")
-                    except Exception:
-                        pass
-                    attempts = 0
-                    deadline = self._now() + max(self._login_timeout_seconds, self._overall_login_timeout_seconds)
-                    while (attempts < self._max_login_retries) and (self._now() < deadline) and not self.has_valid_session(dom):
-                        attempts += 1
-                        try:
-                            print(f"[{dom}] Login attempt {attempts}/{self._max_login_retries}...")
-                        except Exception:
-                            pass
-                        ok = self.open_browser_login(dom)
-                        if self.has_valid_session(dom):
-                            try:
-                                print(f"✅ [{dom}] Login successful! Session saved.")
-                            except Exception:
-                                pass
-                            break
-                        if not ok:
-                            try:
-                                remaining = max(0, int(deadline - self._now()))
-                                print(f"⚠️  [{dom}] Still waiting for login... {remaining}s remaining")
-                            except Exception:
-                                pass
-                        if not self._enable_semi_auto_login:
-                            break
-                    # Record failures for circuit breaker visibility in tests
-                    if not self.has_valid_session(dom):
-                        self._login_circuit_breaker[dom] = self._login_circuit_breaker.get(dom, 0) + attempts
-                else:
-                    try:
-                        print(f"✅ [{dom}] Reusing existing session")
-                    except Exception:
-                        pass
-            except Exception:
-                continue
+            domains.append(dom)
+        return await asyncio.gather(*(self.aensure_logged_in(d) for d in domains), return_exceptions=True)
 
     def open_browser_login(self, domain_or_url: str) -> bool:
         """Open an interactive browser for manual login and persist the session.
 
         Returns True if any cookies, bearer token, or CSRF token were captured.
+        Returns LOGIN_UNAVAILABLE when browser automation is not installed and
+        AUTH_FAILED when access is denied; both are falsy and not worth retrying.
         """
         if not self._enable_semi_auto_login:
             return False
@@ -905,7 +1129,11 @@ class SessionManager:
                     from integrations.browser_automation import InteractiveLogin  # type: ignore
                 except ImportError:
                     log.warning("Browser automation not available")
-                    return False
+                    return LOGIN_UNAVAILABLE
+            driver_pkg = "selenium" if self._browser_driver == "selenium" else "playwright"
+            if importlib.util.find_spec(driver_pkg) is None:
+                log.warning(f"Browser driver {driver_pkg} is not installed")
+                return LOGIN_UNAVAILABLE
         except Exception:
             return False
         try:
@@ -975,6 +1203,12 @@ class SessionManager:
                     print("⚠️  No session data captured from browser")
                 except Exception:
                     pass
+        except ImportError as e:
+            log.warning(f"Browser automation dependency missing: {e}")
+            return LOGIN_UNAVAILABLE
+        except PermissionError as e:
+            log.warning(f"Browser login denied: {e}")
+            return AUTH_FAILED
         except Exception as e:
             try:
                 print(f"❌ Browser login failed: {e}")
@@ -1032,6 +1266,10 @@ class SessionManager:
 
     def clear_expired_sessions(self) -> None:
         """Clear expired sessions from both memory and disk."""
+        self._valid_cache.clear()
+        # Files may be removed below; list the directory again on the next save
+        with self._aggregate_lock:
+            self._domain_index = None
         try:
             # Clear expired sessions from memory
             expired_domains = []
@@ -1062,8 +1300,7 @@ class SessionManager:
                     domain = fname[:-5]
                     session_file = f"{self._sessions_dir}/{fname}"
                     try:
-                        with open(session_file, "r", encoding="utf-8") as f:
-                            data = json.load(f) or {}
+                        data = _read_json(session_file) or {}
                         # Check if session is expired
                         cookies = data.get("cookies") or []
                         bearer = data.get("bearer")
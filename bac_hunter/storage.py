@@ -8,6 +8,32 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Per-connection tuning for concurrent readers/writers (web API, CLI runs, workers).
+# journal_mode=WAL is persistent in the database file, so it is set once in enable_wal().
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA busy_timeout = 30000",
+)
+
+
+def tune_connection(con: sqlite3.Connection) -> None:
+    for pragma in CONNECTION_PRAGMAS:
+        con.execute(pragma)
+
+
+def enable_wal(path: str) -> None:
+    try:
+        con = sqlite3.connect(path, timeout=30.0)
+        try:
+            con.execute("PRAGMA journal_mode = WAL")
+        finally:
+            con.close()
+    except sqlite3.DatabaseError as e:
+        # e.g. filesystems without shared-memory support; rollback journal still works
+        logger.debug(f"WAL not enabled for {path}: {e}")
+
 # Enhanced schema with proper indexing and new tables
 SCHEMA = """
 -- Core tables with proper indexing
@@ -317,6 +343,7 @@ class Storage:
         self._init()
 
     def _init(self):
+        enable_wal(self.path)
         with self.conn() as c:
             c.executescript(SCHEMA)
             c.executescript(INDEXES)
@@ -347,6 +374,7 @@ class Storage:
     def conn(self):
         con = sqlite3.connect(self.path, timeout=30.0)
         con.row_factory = sqlite3.Row  # Enable dict-like access
+        tune_connection(con)
         try:
             yield con
         finally:
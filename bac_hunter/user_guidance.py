@@ -5,8 +5,10 @@ Provides intelligent error messages, next-step recommendations, and contextual h
 """
 
 from __future__ import annotations
+import functools
 import logging
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 from enum import Enum
 
 log = logging.getLogger("guidance")
@@ -24,156 +26,251 @@ class ErrorCategory(Enum):
     DEPENDENCY = "dependency"
     UNKNOWN = "unknown"
 
+# Substring patterns used to categorize error messages
+_ERROR_PATTERNS: Dict[ErrorCategory, List[str]] = {
+    ErrorCategory.AUTHENTICATION: [
+        "401", "unauthorized", "authentication failed", "login failed",
+        "invalid credentials", "session expired", "token expired", "authentication"
+    ],
+    ErrorCategory.NETWORK: [
+        "connection refused", "timeout", "network unreachable", 
+        "dns resolution failed", "connection reset", "ssl error",
+        "timeout occurred"
+    ],
+    ErrorCategory.CONFIGURATION: [
+        "config", "configuration", "missing parameter", "invalid parameter",
+        "file not found", "permission denied"
+    ],
+    ErrorCategory.TARGET_UNREACHABLE: [
+        "404", "not found", "no route to host", "unreachable"
+    ],
+    ErrorCategory.PERMISSION: [
+        "403", "forbidden", "access denied", "insufficient privileges"
+    ],
+    ErrorCategory.WAF_DETECTED: [
+        "blocked by security policy", "waf", "firewall", "cloudflare",
+        "suspicious activity"
+    ],
+    ErrorCategory.RATE_LIMITED: [
+        "429", "too many requests", "rate limit", "throttled"
+    ],
+    ErrorCategory.INVALID_INPUT: [
+        "invalid url", "malformed", "syntax error", "invalid format"
+    ],
+    ErrorCategory.DEPENDENCY: [
+        "modulenotfounderror", "module not found", "import error", "missing dependency",
+        "playwright not installed", "browser not found"
+    ]
+}
+
+# Status codes that settle the category without looking at the message
+_STATUS_CAT: Mapping[int, ErrorCategory] = MappingProxyType({
+    401: ErrorCategory.AUTHENTICATION,
+    403: ErrorCategory.PERMISSION,
+    404: ErrorCategory.TARGET_UNREACHABLE,
+    429: ErrorCategory.RATE_LIMITED,
+    502: ErrorCategory.NETWORK,
+    503: ErrorCategory.NETWORK,
+    504: ErrorCategory.NETWORK,
+})
+
+# Categories are tried in this order; AUTHENTICATION wins over NETWORK, etc.
+_CATEGORY_ORDER: Tuple[ErrorCategory, ...] = (
+    ErrorCategory.AUTHENTICATION,
+    ErrorCategory.WAF_DETECTED,
+    ErrorCategory.RATE_LIMITED,
+    ErrorCategory.NETWORK,
+    ErrorCategory.DEPENDENCY,
+    ErrorCategory.CONFIGURATION,
+    ErrorCategory.PERMISSION,
+    ErrorCategory.INVALID_INPUT,
+    ErrorCategory.TARGET_UNREACHABLE,
+)
+
+
+# (pattern, category) pairs in priority order
+_PatternTable = Tuple[Tuple[str, ErrorCategory], ...]
+
+
+def _pattern_table(patterns: Mapping[ErrorCategory, Sequence[str]],
+                   order: Tuple[ErrorCategory, ...]) -> _PatternTable:
+    """Flatten category patterns into (pattern, category) pairs in priority order.
+
+    One flat loop of substring checks avoids the per-category dict lookups and
+    nested loops; the first pattern found decides the category.
+    """
+    return tuple((p, category) for category in order for p in patterns.get(category, ()))
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# Solutions per error category, read-only and shared by every instance
+_SOLUTION_DATABASE: Mapping[ErrorCategory, Mapping[str, object]] = _freeze({
+    ErrorCategory.AUTHENTICATION: {
+        "description": "Authentication or session-related issues",
+        "quick_fixes": [
+            "Check if login credentials are correct",
+            "Clear existing session data: rm -f auth_data.json sessions/*",
+            "Try manual login: python -m bac_hunter login <target>",
+            "Verify target requires authentication"
+        ],
+        "advanced_solutions": [
+            "Configure custom authentication headers",
+            "Set up session persistence properly",
+            "Check for multi-factor authentication requirements",
+            "Verify cookie domain settings"
+        ],
+        "commands": [
+            "python -m bac_hunter login https://target.com",
+            "python -m bac_hunter session-info https://target.com",
+            "python -m bac_hunter clear-sessions"
+        ]
+    },
+    ErrorCategory.NETWORK: {
+        "description": "Network connectivity issues",
+        "quick_fixes": [
+            "Increase timeout value",
+            "Check internet connection",
+            "Verify target URL is accessible",
+            "Try with different timeout: --timeout 30",
+            "Check proxy settings if using one"
+        ],
+        "advanced_solutions": [
+            "Configure custom DNS servers",
+            "Use different user agent",
+            "Try with proxy: --proxy http://proxy:port",
+            "Increase connection timeout"
+        ],
+        "commands": [
+            "curl -I https://target.com",
+            "python -m bac_hunter scan --timeout 60 https://target.com",
+            "python -m bac_hunter scan --proxy http://proxy:8080 https://target.com"
+        ]
+    },
+    ErrorCategory.WAF_DETECTED: {
+        "description": "Web Application Firewall detected",
+        "quick_fixes": [
+            "Reduce scan speed: --max-rps 0.5",
+            "Enable stealth mode: --mode stealth",
+            "Use random delays: --jitter 2000",
+            "Try different user agent"
+        ],
+        "advanced_solutions": [
+            "Implement custom evasion techniques",
+            "Use rotating proxies",
+            "Fragment requests over time",
+            "Use legitimate-looking headers"
+        ],
+        "commands": [
+            "python -m bac_hunter scan --mode stealth https://target.com",
+            "python -m bac_hunter scan --max-rps 0.2 --jitter 5000 https://target.com"
+        ]
+    },
+    ErrorCategory.CONFIGURATION: {
+        "description": "Configuration or setup issues",
+        "quick_fixes": [
+            "Run setup wizard: python -m bac_hunter setup-wizard",
+            "Check configuration file: .bac-hunter.yml",
+            "Verify all required parameters are set",
+            "Check file permissions"
+        ],
+        "advanced_solutions": [
+            "Create custom configuration profile",
+            "Set environment variables",
+            "Review log files for detailed errors",
+            "Validate configuration syntax"
+        ],
+        "commands": [
+            "python -m bac_hunter setup-wizard",
+            "python -m bac_hunter config validate",
+            "python -m bac_hunter config show"
+        ]
+    },
+    ErrorCategory.DEPENDENCY: {
+        "description": "Missing dependencies or installation issues",
+        "quick_fixes": [
+            "Install missing dependencies: pip install -r requirements.txt",
+            "Install playwright browsers: playwright install",
+            "Check Python version compatibility",
+            "Verify virtual environment is activated"
+        ],
+        "advanced_solutions": [
+            "Use Docker container for isolation",
+            "Install system dependencies",
+            "Update package versions",
+            "Check for conflicting packages"
+        ],
+        "commands": [
+            "pip install -r requirements.txt",
+            "playwright install chromium",
+            "python -m bac_hunter doctor"
+        ]
+    }
+})
+
+
+# Fallback quick fixes for categories without an entry above
+_BASE_SOLUTION_DEFAULTS: Mapping[ErrorCategory, Mapping[str, object]] = _freeze({
+    ErrorCategory.RATE_LIMITED: {
+        "quick_fixes": [
+            "Reduce scan speed with --max-rps",
+            "Enable stealth mode",
+            "Increase jitter/delays"
+        ]
+    }
+})
+_EMPTY_SOLUTIONS: Mapping[str, object] = _freeze({"quick_fixes": []})
+
+# CLI rendering of a guidance result; optional sections are spliced into {sections}
+_CLI_RULE = "=" * 60
+_CLI_TEMPLATE = (
+    "\n" + _CLI_RULE + "\n🔍 BAC Hunter Error Analysis\n" + _CLI_RULE + "\n"
+    "\n{message}\n"
+    "\nSeverity: {icon} {severity}"
+    "{sections}\n"
+    "\n💡 For advanced troubleshooting:\n"
+    "  $ python -m bac_hunter help {category}\n"
+    "  $ python -m bac_hunter doctor\n"
+    "\n" + _CLI_RULE + "\n"
+)
+_SEVERITY_ICONS: Mapping[str, str] = MappingProxyType({"high": "🔴", "medium": "🟡", "low": "🟢"})
+
+# Category -> patterns, frozen the same way
+_FROZEN_ERROR_PATTERNS: Mapping[ErrorCategory, Tuple[str, ...]] = _freeze(_ERROR_PATTERNS)
+
+
 class UserGuidanceSystem:
     """Intelligent guidance system for users."""
     
+    # Shared, read-only tables; assign error_patterns on an instance to override
+    error_patterns: Mapping[ErrorCategory, Sequence[str]] = _FROZEN_ERROR_PATTERNS
+    solution_database: Mapping[ErrorCategory, Mapping[str, object]] = _SOLUTION_DATABASE
+    _DEFAULT_PATTERN_TABLE: _PatternTable = _pattern_table(_FROZEN_ERROR_PATTERNS, _CATEGORY_ORDER)
+    
     def __init__(self):
-        self.error_patterns = self._build_error_patterns()
-        self.solution_database = self._build_solution_database()
         self.context_hints = {}
+        self._guidance_cache = functools.lru_cache(maxsize=1024)(self._build_guidance)
+        self._override_table: Optional[Tuple[Mapping[ErrorCategory, Sequence[str]], _PatternTable]] = None
         
-    def _build_error_patterns(self) -> Dict[ErrorCategory, List[str]]:
-        """Build patterns to categorize errors."""
-        return {
-            ErrorCategory.AUTHENTICATION: [
-                "401", "unauthorized", "authentication failed", "login failed",
-                "invalid credentials", "session expired", "token expired", "authentication"
-            ],
-            ErrorCategory.NETWORK: [
-                "connection refused", "timeout", "network unreachable", 
-                "dns resolution failed", "connection reset", "ssl error",
-                "timeout occurred"
-            ],
-            ErrorCategory.CONFIGURATION: [
-                "config", "configuration", "missing parameter", "invalid parameter",
-                "file not found", "permission denied"
-            ],
-            ErrorCategory.TARGET_UNREACHABLE: [
-                "404", "not found", "no route to host", "unreachable"
-            ],
-            ErrorCategory.PERMISSION: [
-                "403", "forbidden", "access denied", "insufficient privileges"
-            ],
-            ErrorCategory.WAF_DETECTED: [
-                "blocked by security policy", "waf", "firewall", "cloudflare",
-                "suspicious activity"
-            ],
-            ErrorCategory.RATE_LIMITED: [
-                "429", "too many requests", "rate limit", "throttled"
-            ],
-            ErrorCategory.INVALID_INPUT: [
-                "invalid url", "malformed", "syntax error", "invalid format"
-            ],
-            ErrorCategory.DEPENDENCY: [
-                "modulenotfounderror", "module not found", "import error", "missing dependency",
-                "playwright not installed", "browser not found"
-            ]
-        }
-        
-    def _build_solution_database(self) -> Dict[ErrorCategory, Dict[str, str]]:
-        """Build database of solutions for each error category."""
-        return {
-            ErrorCategory.AUTHENTICATION: {
-                "description": "Authentication or session-related issues",
-                "quick_fixes": [
-                    "Check if login credentials are correct",
-                    "Clear existing session data: rm -f auth_data.json sessions/*",
-                    "Try manual login: python -m bac_hunter login <target>",
-                    "Verify target requires authentication"
-                ],
-                "advanced_solutions": [
-                    "Configure custom authentication headers",
-                    "Set up session persistence properly",
-                    "Check for multi-factor authentication requirements",
-                    "Verify cookie domain settings"
-                ],
-                "commands": [
-                    "python -m bac_hunter login https://target.com",
-                    "python -m bac_hunter session-info https://target.com",
-                    "python -m bac_hunter clear-sessions"
-                ]
-            },
-            ErrorCategory.NETWORK: {
-                "description": "Network connectivity issues",
-                "quick_fixes": [
-                    "Increase timeout value",
-                    "Check internet connection",
-                    "Verify target URL is accessible",
-                    "Try with different timeout: --timeout 30",
-                    "Check proxy settings if using one"
-                ],
-                "advanced_solutions": [
-                    "Configure custom DNS servers",
-                    "Use different user agent",
-                    "Try with proxy: --proxy http://proxy:port",
-                    "Increase connection timeout"
-                ],
-                "commands": [
-                    "curl -I https://target.com",
-                    "python -m bac_hunter scan --timeout 60 https://target.com",
-                    "python -m bac_hunter scan --proxy http://proxy:8080 https://target.com"
-                ]
-            },
-            ErrorCategory.WAF_DETECTED: {
-                "description": "Web Application Firewall detected",
-                "quick_fixes": [
-                    "Reduce scan speed: --max-rps 0.5",
-                    "Enable stealth mode: --mode stealth",
-                    "Use random delays: --jitter 2000",
-                    "Try different user agent"
-                ],
-                "advanced_solutions": [
-                    "Implement custom evasion techniques",
-                    "Use rotating proxies",
-                    "Fragment requests over time",
-                    "Use legitimate-looking headers"
-                ],
-                "commands": [
-                    "python -m bac_hunter scan --mode stealth https://target.com",
-                    "python -m bac_hunter scan --max-rps 0.2 --jitter 5000 https://target.com"
-                ]
-            },
-            ErrorCategory.CONFIGURATION: {
-                "description": "Configuration or setup issues",
-                "quick_fixes": [
-                    "Run setup wizard: python -m bac_hunter setup-wizard",
-                    "Check configuration file: .bac-hunter.yml",
-                    "Verify all required parameters are set",
-                    "Check file permissions"
-                ],
-                "advanced_solutions": [
-                    "Create custom configuration profile",
-                    "Set environment variables",
-                    "Review log files for detailed errors",
-                    "Validate configuration syntax"
-                ],
-                "commands": [
-                    "python -m bac_hunter setup-wizard",
-                    "python -m bac_hunter config validate",
-                    "python -m bac_hunter config show"
-                ]
-            },
-            ErrorCategory.DEPENDENCY: {
-                "description": "Missing dependencies or installation issues",
-                "quick_fixes": [
-                    "Install missing dependencies: pip install -r requirements.txt",
-                    "Install playwright browsers: playwright install",
-                    "Check Python version compatibility",
-                    "Verify virtual environment is activated"
-                ],
-                "advanced_solutions": [
-                    "Use Docker container for isolation",
-                    "Install system dependencies",
-                    "Update package versions",
-                    "Check for conflicting packages"
-                ],
-                "commands": [
-                    "pip install -r requirements.txt",
-                    "playwright install chromium",
-                    "python -m bac_hunter doctor"
-                ]
-            }
-        }
+    def _category_table(self) -> _PatternTable:
+        """Return the (pattern, category) table for this instance's error_patterns.
+
+        Only an instance that overrides error_patterns builds its own table,
+        rebuilt whenever a different mapping is assigned.
+        """
+        patterns = self.error_patterns
+        if patterns is _FROZEN_ERROR_PATTERNS:
+            return self._DEFAULT_PATTERN_TABLE
+        if self._override_table is None or self._override_table[0] is not patterns:
+            self._override_table = (patterns, _pattern_table(patterns, _CATEGORY_ORDER))
+        return self._override_table[1]
         
     def categorize_error(self, error_message: str, status_code: Optional[int] = None) -> ErrorCategory:
         """Categorize an error based on message and status code."""
@@ -182,58 +279,42 @@ class UserGuidanceSystem:
         error_lower = error_message.lower()
         
         # Check status code first
-        if status_code:
-            if status_code == 401:
-                return ErrorCategory.AUTHENTICATION
-            elif status_code == 403:
-                # If message indicates WAF/security policy, prefer WAF_DETECTED
-                if error_lower and any(p in error_lower for p in self.error_patterns.get(ErrorCategory.WAF_DETECTED, [])):
-                    return ErrorCategory.WAF_DETECTED
-                return ErrorCategory.PERMISSION
-            elif status_code == 404:
-                return ErrorCategory.TARGET_UNREACHABLE
-            elif status_code == 429:
-                return ErrorCategory.RATE_LIMITED
-                
-        # Check message patterns
-        # Prioritize categories deterministically: AUTHENTICATION before NETWORK, then others
-        ordered = [
-            ErrorCategory.AUTHENTICATION,
-            ErrorCategory.WAF_DETECTED,
-            ErrorCategory.RATE_LIMITED,
-            ErrorCategory.NETWORK,
-            ErrorCategory.DEPENDENCY,
-            ErrorCategory.CONFIGURATION,
-            ErrorCategory.PERMISSION,
-            ErrorCategory.INVALID_INPUT,
-            ErrorCategory.TARGET_UNREACHABLE,
-        ]
-        for category in ordered:
-            patterns = self.error_patterns.get(category, [])
-            for pattern in patterns:
-                if pattern in error_lower:
-                    return category
+        category = _STATUS_CAT.get(status_code)
+        if category is not None:
+            # If a 403 message indicates WAF/security policy, prefer WAF_DETECTED
+            if category is ErrorCategory.PERMISSION and error_lower and any(
+                    p in error_lower for p in self.error_patterns.get(ErrorCategory.WAF_DETECTED, ())):
+                return ErrorCategory.WAF_DETECTED
+            return category
                 
+        # Patterns are in priority order, so the first hit is the category
+        for pattern, category in self._category_table():
+            if pattern in error_lower:
+                return category
         return ErrorCategory.UNKNOWN
         
     def get_guidance(self, error_message: str, status_code: Optional[int] = None, 
-                    context: Optional[str] = None) -> Dict[str, any]:
-        """Get comprehensive guidance for an error."""
+                    context: Optional[str] = None) -> Mapping[str, object]:
+        """Get comprehensive guidance for an error.
+
+        Repeated errors (same message, status and context) are served from a
+        per-instance LRU cache. The result is shared, so it is read-only:
+        mappings are MappingProxyType and lists are tuples.
+        """
+        try:
+            return self._guidance_cache(error_message, status_code, context)
+        except TypeError:
+            # Unhashable input: build without caching
+            return self._build_guidance(error_message, status_code, context)
+        
+    def _build_guidance(self, error_message: str, status_code: Optional[int],
+                        context: Optional[str]) -> Mapping[str, object]:
         category = self.categorize_error(error_message, status_code)
         
         # Ensure solutions contain at least base quick fixes for known categories
-        base_defaults = {
-            ErrorCategory.RATE_LIMITED: {
-                "quick_fixes": [
-                    "Reduce scan speed with --max-rps",
-                    "Enable stealth mode",
-                    "Increase jitter/delays"
-                ]
-            }
-        }
-        solutions = self.solution_database.get(category, {"quick_fixes": []})
-        if category in base_defaults and not solutions.get("quick_fixes"):
-            solutions = base_defaults[category]
+        solutions = self.solution_database.get(category, _EMPTY_SOLUTIONS)
+        if category in _BASE_SOLUTION_DEFAULTS and not solutions.get("quick_fixes"):
+            solutions = _BASE_SOLUTION_DEFAULTS[category]
 
         guidance = {
             "error_category": category.value,
@@ -248,7 +329,7 @@ class UserGuidanceSystem:
             "troubleshooting_commands": self._get_troubleshooting_commands(category)
         }
         
-        return guidance
+        return _freeze(guidance)
         
     def _assess_severity(self, category: ErrorCategory, error_message: str) -> str:
         """Assess error severity."""
@@ -336,69 +417,65 @@ class UserGuidanceSystem:
         
         return commands_map.get(category, ["python -m bac_hunter --help"])
         
-    def format_guidance_for_cli(self, guidance: Dict[str, any]) -> str:
+    def format_guidance_for_cli(self, guidance: Mapping[str, object]) -> str:
         """Format guidance for CLI display."""
-        output = []
-        
-        # Header
-        output.append(f"\n{'='*60}")
-        output.append(f"🔍 BAC Hunter Error Analysis")
-        output.append(f"{'='*60}")
-        
-        # Friendly message
-        output.append(f"\n{guidance['user_friendly_message']}")
-        
-        # Severity indicator
-        severity_icons = {"high": "🔴", "medium": "🟡", "low": "🟢"}
-        severity_icon = severity_icons.get(guidance['severity'], "⚪")
-        output.append(f"\nSeverity: {severity_icon} {guidance['severity'].upper()}")
+        solutions = guidance.get('solutions', {})
+        sections = []
         
         # Quick fixes
-        solutions = guidance.get('solutions', {})
         if 'quick_fixes' in solutions:
-            output.append(f"\n🔧 Quick Fixes:")
-            for i, fix in enumerate(solutions['quick_fixes'][:3], 1):
-                output.append(f"  {i}. {fix}")
+            sections.append("\n\n🔧 Quick Fixes:")
+            sections.extend(f"\n  {i}. {fix}" for i, fix in enumerate(solutions['quick_fixes'][:3], 1))
                 
         # Next steps
         if guidance.get('next_steps'):
-            output.append(f"\n📋 Next Steps:")
-            for i, step in enumerate(guidance['next_steps'][:3], 1):
-                output.append(f"  {i}. {step}")
+            sections.append("\n\n📋 Next Steps:")
+            sections.extend(f"\n  {i}. {step}" for i, step in enumerate(guidance['next_steps'][:3], 1))
                 
         # Helpful commands
         if 'commands' in solutions:
-            output.append(f"\n💻 Helpful Commands:")
-            for cmd in solutions['commands'][:3]:
-                output.append(f"  $ {cmd}")
-                
-        # Advanced help
-        output.append(f"\n💡 For advanced troubleshooting:")
-        output.append(f"  $ python -m bac_hunter help {guidance['error_category']}")
-        output.append(f"  $ python -m bac_hunter doctor")
+            sections.append("\n\n💻 Helpful Commands:")
+            sections.extend(f"\n  $ {cmd}" for cmd in solutions['commands'][:3])
         
-        output.append(f"\n{'='*60}\n")
-        
-        return '\n'.join(output)
+        return _CLI_TEMPLATE.format(
+            message=guidance['user_friendly_message'],
+            icon=_SEVERITY_ICONS.get(guidance['severity'], "⚪"),
+            severity=guidance['severity'].upper(),
+            sections="".join(sections),
+            category=guidance['error_category'],
+        )
+
+# Shared instance, created on first use rather than at import
+_guidance_system: Optional[UserGuidanceSystem] = None
 
-# Global instance
-guidance_system = UserGuidanceSystem()
+def _get_gs() -> UserGuidanceSystem:
+    """Return the shared guidance system, creating it lazily."""
+    global _guidance_system
+    if _guidance_system is None:
+        _guidance_system = UserGuidanceSystem()
+    return _guidance_system
+
+def __getattr__(name: str):
+    # Keep `guidance_system` importable as a module attribute without eager construction
+    if name == "guidance_system":
+        return _get_gs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def handle_error_with_guidance(error: Exception, context: Optional[str] = None, 
                              status_code: Optional[int] = None) -> str:
     """Handle an error and return formatted guidance."""
     try:
         error_message = str(error)
-        guidance = guidance_system.get_guidance(error_message, status_code, context)
-        return guidance_system.format_guidance_for_cli(guidance)
+        gs = _get_gs()
+        guidance = gs.get_guidance(error_message, status_code, context)
+        return gs.format_guidance_for_cli(guidance)
     except Exception as e:
         log.error(f"Error in guidance system: {e}")
         return f"\n❌ Error: {error}\n💡 Try: python -m bac_hunter --help\n"
 
-def get_contextual_help(command: str, error_type: Optional[str] = None) -> str:
-    """Get contextual help for a command or error type."""
-    help_content = {
-        "scan": """
+# Help text per command, shared by every get_contextual_help call
+_HELP_CONTENT: Mapping[str, str] = MappingProxyType({
+    "scan": """
 🔍 BAC Hunter Scan Help
 
 Basic Usage:
@@ -418,7 +495,7 @@ Troubleshooting:
   python -m bac_hunter doctor  # Check system health
   python -m bac_hunter scan --verbose https://target.com
         """,
-        "login": """
+    "login": """
 🔐 BAC Hunter Login Help
 
 Interactive Login:
@@ -439,6 +516,8 @@ Troubleshooting:
   - Check that Playwright browsers are installed: playwright install
   - For headless environments, set BH_OFFLINE=1
         """
-    }
-    
-    return help_content.get(command, f"No specific help available for '{command}'")
\ No newline at end of file
+})
+
+def get_contextual_help(command: str, error_type: Optional[str] = None) -> str:
+    """Get contextual help for a command or error type."""
+    return _HELP_CONTENT.get(command, f"No specific help available for '{command}'")
@@ -1,8 +1,9 @@
 import random
 import asyncio
+from functools import lru_cache
 from urllib.parse import urlparse, urljoin, urlunparse
 
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/118",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 Version/15 Safari/605.1.15",
@@ -11,25 +12,35 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 13_5) AppleWebKit/537.36 Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:123.0) Gecko/20100101 Firefox/123.0",
     "Mozilla/5.0 (iPhone; CPU iPhone OS 16_4 like Mac OS X) AppleWebKit/605.1.15 Version/16.4 Mobile/15E148 Safari/604.1",
-]
+)
 
+# Private generator: UA/jitter sampling does not share state with the global random module
+_rng = random.Random()
 
-def pick_ua() -> str:
-    return random.choice(USER_AGENTS)
 
+def pick_ua(_choice=_rng.choice, _uas=USER_AGENTS) -> str:
+    return _choice(_uas)
 
+
+# Memoized: crawls hit the same URLs repeatedly. Arguments must be hashable (str).
+@lru_cache(maxsize=4096)
 def host_of(url: str) -> str:
     return urlparse(url).netloc
 
 
+@lru_cache(maxsize=2048)
 def join_url(base: str, maybe_path: str) -> str:
     return urljoin(base, maybe_path)
 
 
-async def jitter(ms: int):
+async def jitter(ms: int, _uniform=_rng.uniform):
     if ms <= 0:
         return
-    await asyncio.sleep(random.uniform(0, ms / 1000.0))
+    d = _uniform(0.0, ms * 0.001)
+    # Sub-0.1ms sleeps are not worth an event loop round-trip
+    if d < 1e-4:
+        return
+    await asyncio.sleep(d)
 
 
 # --- Smart path helpers for deduplication and normalization ---
@@ -1,10 +1,40 @@
 # conftest.py
+import asyncio
 import os
+import sys
 import pytest
 
+try:
+	import uvloop
+except ImportError:
+	uvloop = None
+
+# Make the package importable from a checkout, whatever the import mode
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _ROOT not in sys.path:
+	sys.path.insert(0, _ROOT)
+
 # Ensure tests are not influenced by local auth_data.json
 os.environ.setdefault("BH_DISABLE_AUTH_STORE", "1")
 
+
+def pytest_configure(config):
+	# Registered here so the marker is known even without pytest-xdist installed
+	config.addinivalue_line(
+		"markers",
+		"xdist_group(name): keep stateful tests on one worker under --dist=loadgroup",
+	)
+	config.addinivalue_line(
+		"markers",
+		"ai: needs the optional AI extras; deselect with -m 'not ai'",
+	)
+	# Run async tests on uvloop when it is installed. Setting the global policy
+	# is picked up by pytest-asyncio's default event_loop_policy fixture, so
+	# the fixture itself need not be overridden (deprecated in pytest-asyncio 1.x)
+	if uvloop is not None and sys.platform != "win32":
+		asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 @pytest.fixture(autouse=True)
 def _reset_env_for_tests(monkeypatch):
 	# Provide consistent environment for each test without forcing offline mode
@@ -40,6 +70,13 @@ def sample_responses():
 	]
 
 
+@pytest.fixture(scope="session")
+def guidance_system():
+	# UserGuidanceSystem holds no per-test state, so one instance is shared
+	from bac_hunter.user_guidance import UserGuidanceSystem
+	return UserGuidanceSystem()
+
+
 # Intentionally do not define a generic session_manager fixture to avoid
 # interfering with tests that provide their own specialized fixtures.
 @pytest.fixture
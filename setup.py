@@ -63,6 +63,8 @@ setup(
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.5.0",
+            "uvloop>=0.19.0; sys_platform != 'win32'",
             "black>=23.12.0",
             "flake8>=6.1.0",
             "mypy>=1.8.0",
@@ -4,6 +4,7 @@ Unit tests for enhanced session manager with circuit breaker functionality.
 
 import pytest
 import asyncio
+import itertools
 import tempfile
 import os
 from unittest.mock import Mock, patch, AsyncMock
@@ -89,14 +90,64 @@ class TestEnhancedSessionManager:
         
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep') as mock_sleep:
+                with patch('asyncio.sleep') as mock_sleep:
                     with patch.object(session_manager, '_now', side_effect=[1000.0, 1005.0, 1015.0]):
                         result = session_manager.ensure_logged_in(domain)
                         
-        # Should have called sleep for progressive delays
-        # First attempt: no delay, second attempt: 5s delay
+        # Retries wait a jittered backoff (capped by max_backoff_ms); the first attempt does not
         mock_sleep.assert_called()
         
+    def test_half_open_admits_single_probe(self, session_manager):
+        """Test that an expired backoff allows exactly one probe login."""
+        domain = "example.com"
+        session_manager._login_circuit_breaker = {domain: 3}
+        session_manager._login_backoff_until = {domain: 900.0}  # expired at _now=1000
+        
+        login = Mock(return_value=False)
+        with patch.object(session_manager, 'has_valid_session', return_value=False):
+            with patch.object(session_manager, '_aopen_browser_login', AsyncMock(side_effect=lambda url: login(url))):
+                with patch.object(session_manager, '_now', return_value=1000.0):
+                    result = session_manager.ensure_logged_in(domain)
+        
+        assert result is False
+        assert login.call_count == 1
+        # Failed probe re-opens the breaker with the next backoff step
+        assert session_manager._login_backoff_until[domain] == 1000.0 + 300
+        assert domain not in session_manager._login_probing
+        
+    def test_cancelled_probe_releases_probe_slot(self, session_manager):
+        """Test that a cancelled half-open probe does not block future probes."""
+        domain = "example.com"
+        session_manager._login_circuit_breaker = {domain: 3}
+        session_manager._login_backoff_until = {domain: 900.0}  # expired at _now=1000
+        started = asyncio.Event()
+        
+        async def hanging_login(url):
+            started.set()
+            await asyncio.sleep(3600)
+        
+        async def run():
+            task = asyncio.ensure_future(session_manager.aensure_logged_in(domain))
+            await started.wait()
+            assert domain in session_manager._login_probing
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        with patch.object(session_manager, 'has_valid_session', return_value=False):
+            with patch.object(session_manager, '_aopen_browser_login', side_effect=hanging_login):
+                with patch.object(session_manager, '_now', return_value=1000.0):
+                    asyncio.run(run())
+        
+        assert domain not in session_manager._login_probing
+        # Still HALF_OPEN, so the next call is admitted as a fresh probe
+        login = AsyncMock(return_value=True)
+        with patch.object(session_manager, 'has_valid_session', return_value=False):
+            with patch.object(session_manager, '_aopen_browser_login', login):
+                with patch.object(session_manager, '_now', return_value=1000.0):
+                    assert session_manager.ensure_logged_in(domain) is True
+        assert login.call_count == 1
+        
     def test_backoff_time_remaining_calculation(self, session_manager):
         """Test that backoff time remaining is calculated correctly."""
         domain = "example.com"
@@ -169,7 +220,7 @@ class TestEnhancedSessionManager:
         # Mock failed login attempts
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual sleep
+                with patch('asyncio.sleep'):  # Skip actual sleep
                     with patch.object(session_manager, '_now', return_value=1000.0):
                         result = session_manager.ensure_logged_in(domain)
                         
@@ -178,19 +229,19 @@ class TestEnhancedSessionManager:
         assert domain in session_manager._login_circuit_breaker
         assert session_manager._login_circuit_breaker[domain] >= 1
         
-    def test_session_validation_bypass_during_backoff(self, session_manager):
-        """Test that valid sessions are still detected during backoff period."""
+    def test_backoff_fails_fast_without_session_io(self, session_manager):
+        """Test that an open breaker returns before any session lookup."""
         domain = "example.com"
         
         # Set domain in backoff state
         session_manager._login_backoff_until = {domain: time.time() + 100}
         
-        # But session becomes valid
-        with patch.object(session_manager, 'has_valid_session', return_value=True):
+        # Even a valid session is not looked up while the breaker is open
+        with patch.object(session_manager, 'has_valid_session', return_value=True) as has_session:
             result = session_manager.ensure_logged_in(domain)
             
-        # Should succeed despite backoff because session is valid
-        assert result is True
+        assert result is False
+        has_session.assert_not_called()
         
     def test_timeout_enforcement(self, session_manager):
         """Test that overall timeout is enforced during login attempts."""
@@ -200,14 +251,17 @@ class TestEnhancedSessionManager:
         start_time = 1000.0
         timeout_time = start_time + session_manager._overall_login_timeout_seconds + 1
         
+        # The deadline is computed from the monotonic clock, which then jumps past it
+        clock = itertools.chain([start_time], itertools.repeat(timeout_time))
         with patch.object(session_manager, 'has_valid_session', return_value=False):
-            with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):
-                    with patch.object(session_manager, '_now', side_effect=[start_time, timeout_time]):
+            with patch.object(session_manager, '_aopen_browser_login', AsyncMock(return_value=False)) as mock_login:
+                with patch('asyncio.sleep'):
+                    with patch.object(session_manager, '_clock', side_effect=lambda: next(clock)):
                         result = session_manager.ensure_logged_in(domain)
                         
-        # Should timeout and fail
+        # Should timeout and fail without opening the browser
         assert result is False
+        mock_login.assert_not_awaited()
         
     def test_max_retries_enforcement(self, session_manager):
         """Test that maximum retries are enforced."""
@@ -221,7 +275,7 @@ class TestEnhancedSessionManager:
             
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', side_effect=mock_open_browser_login):
-                with patch('time.sleep'):
+                with patch('asyncio.sleep'):
                     with patch.object(session_manager, '_now', return_value=1000.0):
                         result = session_manager.ensure_logged_in(domain)
                         
@@ -4,39 +4,66 @@ Integration tests for BAC Hunter enhanced features.
 
 import pytest
 import asyncio
-import tempfile
 import os
-from pathlib import Path
+import types
+from dataclasses import dataclass
+from typing import Mapping
 from unittest.mock import Mock, AsyncMock, patch
 
 # Import the modules to test
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bac_hunter'))
-
 from bac_hunter.session_manager import SessionManager
 from bac_hunter.rate_limiter import AdaptiveRateLimiter
-from bac_hunter.user_guidance import UserGuidanceSystem
 from bac_hunter.plugins.enhanced_graphql import EnhancedGraphQLTester
 from bac_hunter.integrations.enhanced_nuclei import EnhancedNucleiRunner
 
 
+@dataclass(slots=True)
+class _Resp:
+    """Lightweight stand-in for an HTTP response."""
+    status_code: int
+    headers: dict
+    _json: dict
+    
+    def json(self):
+        return self._json
+
+
+_HDR = {'content-type': 'application/json'}
+_EMPTY_DATA = {'data': {}}
+
+
+def _reset_session_manager_state(sm):
+    """Drop a shared session manager's saved sessions, caches and login breaker state."""
+    for attr in ('_login_backoff_until', '_login_circuit_breaker', '_login_probing',
+                 '_valid_cache', '_domain_sessions'):
+        getattr(sm, attr, {}).clear()
+    sm._domain_index = None
+    for name in os.listdir(sm._sessions_dir):
+        os.remove(os.path.join(sm._sessions_dir, name))
+
+
 class TestSessionManagerIntegration:
     """Integration tests for session manager enhancements."""
     
-    @pytest.fixture
-    def session_manager(self):
+    @pytest.fixture(scope="module")
+    def session_manager(self, tmp_path_factory):
         """Create a session manager for integration testing."""
         sm = SessionManager()
-        with tempfile.TemporaryDirectory() as temp_dir:
-            sm.configure(
-                sessions_dir=temp_dir,
-                browser_driver="playwright",
-                login_timeout_seconds=10,
-                enable_semi_auto_login=False,  # Disable for testing
-                max_login_retries=1,
-                overall_login_timeout_seconds=30
-            )
-            yield sm
+        sm.configure(
+            sessions_dir=str(tmp_path_factory.mktemp("sessions")),
+            browser_driver="playwright",
+            login_timeout_seconds=10,
+            enable_semi_auto_login=False,  # Disable for testing
+            max_login_retries=1,
+            overall_login_timeout_seconds=30
+        )
+        return sm
+        
+    @pytest.fixture(autouse=True)
+    def _reset_session_manager(self, session_manager):
+        """Clear sessions and login breaker state so tests stay isolated."""
+        _reset_session_manager_state(session_manager)
+        yield
             
     def test_session_persistence_workflow(self, session_manager):
         """Test complete session persistence workflow."""
@@ -70,33 +97,41 @@ class TestSessionManagerIntegration:
         domain = "failing.example.com"
         
         # Simulate multiple failures
-        with patch.object(session_manager, 'has_valid_session', return_value=False):
-            with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
-                    # First few attempts should proceed
-                    for i in range(3):
-                        result = session_manager.ensure_logged_in(domain)
-                        assert result is False
-                        
-                    # After enough failures, should trigger circuit breaker
-                    with patch.object(session_manager, '_now', return_value=1000.0):
-                        result = session_manager.ensure_logged_in(domain)
-                        assert result is False
-                        
-                    # Should be in backoff state
-                    assert domain in session_manager._login_backoff_until
+        with patch.multiple(
+            session_manager,
+            has_valid_session=Mock(return_value=False),
+            open_browser_login=Mock(return_value=False),
+        ), patch('asyncio.sleep'):  # Skip actual delays
+            # First few attempts should proceed
+            for i in range(3):
+                result = session_manager.ensure_logged_in(domain)
+                assert result is False
+                
+            # After enough failures, should trigger circuit breaker
+            with patch.object(session_manager, '_now', return_value=1000.0):
+                result = session_manager.ensure_logged_in(domain)
+                assert result is False
+                
+            # Should be in backoff state
+            assert domain in session_manager._login_backoff_until
 
 
 class TestRateLimiterIntegration:
     """Integration tests for enhanced rate limiter."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def rate_limiter(self):
         """Create a rate limiter for integration testing."""
-        calibrator = Mock()
-        calibrator.current_rps = 5.0
+        calibrator = types.SimpleNamespace(current_rps=5.0)
         return AdaptiveRateLimiter(10.0, 5.0, calibrator)
         
+    @pytest.fixture(autouse=True)
+    def _reset_rate_limiter(self, rate_limiter):
+        """Clear per-host health and throttle state between tests."""
+        yield
+        rate_limiter._emergency_throttle.clear()
+        rate_limiter._host_health.clear()
+        
     @pytest.fixture
     def mock_waf_detector(self):
         """Create a mock WAF detector."""
@@ -154,11 +189,6 @@ class TestRateLimiterIntegration:
 class TestUserGuidanceIntegration:
     """Integration tests for user guidance system."""
     
-    @pytest.fixture
-    def guidance_system(self):
-        """Create a guidance system for testing."""
-        return UserGuidanceSystem()
-        
     def test_complete_error_handling_workflow(self, guidance_system):
         """Test complete error handling workflow."""
         # Step 1: Categorize error
@@ -195,7 +225,7 @@ class TestUserGuidanceIntegration:
 class TestGraphQLIntegration:
     """Integration tests for enhanced GraphQL testing."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def graphql_tester(self):
         """Create a GraphQL tester for integration testing."""
         tester = EnhancedGraphQLTester()
@@ -209,44 +239,33 @@ class TestGraphQLIntegration:
         """Test complete GraphQL testing workflow."""
         endpoint = "https://api.example.com/graphql"
         
-        # Mock responses for different test phases
+        # Stub responses for different test phases
         responses = [
             # Basic detection
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-            # Introspection  
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-            # Authorization tests
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-            # Complexity tests
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-            Mock(status_code=200, headers={'content-type': 'application/json'}),
-        ]
-        
-        # Setup JSON responses
-        responses[0].json.return_value = {'data': {'__typename': 'Query'}}
-        responses[1].json.return_value = {
-            'data': {
-                '__schema': {
-                    'queryType': {'name': 'Query'},
-                    'types': [
-                        {
-                            'name': 'User',
-                            'kind': 'OBJECT',
-                            'fields': [
-                                {'name': 'id'},
-                                {'name': 'email'},
-                                {'name': 'password'}  # Sensitive field
-                            ]
-                        }
-                    ]
+            _Resp(200, _HDR, {'data': {'__typename': 'Query'}}),
+            # Introspection
+            _Resp(200, _HDR, {
+                'data': {
+                    '__schema': {
+                        'queryType': {'name': 'Query'},
+                        'types': [
+                            {
+                                'name': 'User',
+                                'kind': 'OBJECT',
+                                'fields': [
+                                    {'name': 'id'},
+                                    {'name': 'email'},
+                                    {'name': 'password'}  # Sensitive field
+                                ]
+                            }
+                        ]
+                    }
                 }
-            }
-        }
+            }),
+        ]
+        # Authorization tests (2) and complexity tests (2)
+        responses += [_Resp(200, _HDR, _EMPTY_DATA) for _ in range(4)]
         
-        for i in range(2, len(responses)):
-            responses[i].json.return_value = {'data': {}}
-            
         graphql_tester.http.post.side_effect = responses
         
         # Run complete test
@@ -265,8 +284,8 @@ class TestGraphQLIntegration:
 class TestNucleiIntegration:
     """Integration tests for enhanced Nuclei integration."""
     
-    @pytest.fixture
-    def nuclei_runner(self):
+    @pytest.fixture(scope="module")
+    def nuclei_runner(self, tmp_path_factory):
         """Create a Nuclei runner for integration testing."""
         storage = Mock()
         storage.add_finding_for_url = Mock()
@@ -275,10 +294,8 @@ class TestNucleiIntegration:
         runner.runner = Mock()
         runner.runner.run_tool = AsyncMock()
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            runner.custom_templates_dir = Path(temp_dir)
-            runner.custom_templates_dir.mkdir(exist_ok=True)
-            yield runner
+        runner.custom_templates_dir = tmp_path_factory.mktemp("nuclei_templates", numbered=True)
+        return runner
             
     async def test_complete_nuclei_workflow(self, nuclei_runner):
         """Test complete Nuclei integration workflow."""
@@ -289,72 +306,81 @@ class TestNucleiIntegration:
         }
         
         # Mock successful initialization
-        with patch('shutil.which', return_value='/usr/bin/nuclei'):
-            with patch.object(nuclei_runner, '_update_nuclei_templates', return_value=True):
-                with patch.object(nuclei_runner, '_ensure_custom_templates'):
-                    # Mock scan results
-                    mock_finding = {
-                        'template-id': 'bac-hunter-idor',
-                        'matched-at': 'https://api.example.com/users/123',
-                        'info': {'severity': 'high', 'name': 'IDOR Vulnerability'}
-                    }
-                    
-                    import json
-                    mock_stdout = json.dumps(mock_finding) + '\n'
-                    nuclei_runner.runner.run_tool.return_value = {
-                        'success': True,
-                        'stdout': mock_stdout
-                    }
-                    
-                    # Run complete workflow
-                    results = await nuclei_runner.scan_with_context(targets, context, rps=1.0)
-                    
-                    # Verify results
-                    assert len(results) > 0
-                    assert results[0]['template-id'] == 'bac-hunter-idor'
-                    assert 'bac_category' in results[0]
-                    assert 'risk_assessment' in results[0]
-                    assert 'remediation' in results[0]
-                    assert 'owasp_mapping' in results[0]
-                    
-                    # Verify database storage was called
-                    nuclei_runner.db.add_finding_for_url.assert_called()
+        with patch('shutil.which', return_value='/usr/bin/nuclei'), patch.multiple(
+            nuclei_runner,
+            _update_nuclei_templates=AsyncMock(return_value=True),
+            _ensure_custom_templates=AsyncMock(),
+        ):
+            # Mock scan results
+            mock_finding = {
+                'template-id': 'bac-hunter-idor',
+                'matched-at': 'https://api.example.com/users/123',
+                'info': {'severity': 'high', 'name': 'IDOR Vulnerability'}
+            }
+            
+            import json
+            mock_stdout = json.dumps(mock_finding) + '\n'
+            nuclei_runner.runner.run_tool.return_value = {
+                'success': True,
+                'stdout': mock_stdout
+            }
+            
+            # Run complete workflow
+            results = await nuclei_runner.scan_with_context(targets, context, rps=1.0)
+            
+            # Verify results
+            assert len(results) > 0
+            assert results[0]['template-id'] == 'bac-hunter-idor'
+            assert 'bac_category' in results[0]
+            assert 'risk_assessment' in results[0]
+            assert 'remediation' in results[0]
+            assert 'owasp_mapping' in results[0]
+            
+            # Verify database storage was called
+            nuclei_runner.db.add_finding_for_url.assert_called()
 
 
+@pytest.mark.xdist_group("session_state")
 class TestCrossComponentIntegration:
     """Test integration between different enhanced components."""
     
-    @pytest.fixture
-    def integrated_setup(self):
+    @pytest.fixture(scope="module")
+    def integrated_setup(self, tmp_path_factory, guidance_system):
         """Setup multiple components for cross-integration testing."""
         # Session manager
         sm = SessionManager()
-        with tempfile.TemporaryDirectory() as temp_dir:
-            sm.configure(
-                sessions_dir=temp_dir,
-                enable_semi_auto_login=False
-            )
-            
-            # Rate limiter
-            calibrator = Mock()
-            calibrator.current_rps = 2.0
-            rl = AdaptiveRateLimiter(5.0, 2.0, calibrator)
-            
-            # WAF detector
-            waf = Mock()
-            waf.should_throttle_heavily.return_value = False
-            waf.get_recommended_delay.return_value = 1.0
-            rl.set_waf_detector(waf)
-            
-            # User guidance
-            guidance = UserGuidanceSystem()
-            
-            yield {
-                'session_manager': sm,
-                'rate_limiter': rl,
-                'waf_detector': waf,
-                'guidance': guidance
-            }
+        sm.configure(
+            sessions_dir=str(tmp_path_factory.mktemp("sessions")),
+            enable_semi_auto_login=False
+        )
+        
+        # Rate limiter
+        calibrator = types.SimpleNamespace(current_rps=2.0)
+        rl = AdaptiveRateLimiter(5.0, 2.0, calibrator)
+        
+        # WAF detector
+        waf = Mock()
+        rl.set_waf_detector(waf)
+        
+        return {
+            'session_manager': sm,
+            'rate_limiter': rl,
+            'waf_detector': waf,
+            'guidance': guidance_system
+        }
+        
+    @pytest.fixture(autouse=True)
+    def _reset_integrated_setup(self, integrated_setup):
+        """Restore shared component state before each test."""
+        sm = integrated_setup['session_manager']
+        rl = integrated_setup['rate_limiter']
+        waf = integrated_setup['waf_detector']
+        _reset_session_manager_state(sm)
+        rl._emergency_throttle.clear()
+        rl._host_health.clear()
+        waf.should_throttle_heavily.return_value = False
+        waf.get_recommended_delay.return_value = 1.0
+        yield
             
     def test_session_and_rate_limiter_integration(self, integrated_setup):
         """Test integration between session manager and rate limiter."""
@@ -373,6 +399,7 @@ class TestCrossComponentIntegration:
         # Both components should maintain independent state
         assert sm.has_valid_session(domain)
         assert rl._host_health[domain]['blocks'] == 1
+        assert len(rl._host_health[domain]['block_ts']) == 1
         
     @pytest.mark.asyncio
     async def test_rate_limiter_and_waf_integration(self, integrated_setup):
@@ -417,36 +444,61 @@ class TestCrossComponentIntegration:
         assert any('login' in fix.lower() for fix in auth_guidance['solutions']['quick_fixes'])
 
 
+# Static inputs for the end-to-end workflow tests
+_E2E_RESPONSES = (
+    {
+        'url': 'https://api.example.com/users/123',
+        'status_code': 200,
+        'headers': {'content-type': 'application/json'},
+        'body': '{"user_id": 123, "email": "test@example.com"}',
+        'request_headers': {'Authorization': 'Bearer token123'}
+    },
+    {
+        'url': 'https://api.example.com/admin/dashboard',
+        'status_code': 200,
+        'headers': {'content-type': 'text/html'},
+        'body': '<h1>Admin Panel</h1>',
+        'request_headers': {'Cookie': 'session=user123'}
+    }
+)
+
+_CONFIG: Mapping[str, Mapping[str, object]] = types.MappingProxyType({
+    'performance': {
+        'max_rps': 2.0,
+        'enable_adaptive_throttle': True,
+        'enable_waf_detection': True
+    },
+    'session': {
+        'enable_semi_auto_login': False,
+        'max_login_retries': 2,
+        'login_timeout_seconds': 30
+    },
+    'intelligence': {
+        'enable_ai_analysis': True,
+        'enable_anomaly_detection': True
+    }
+})
+
+
 class TestEndToEndWorkflows:
     """End-to-end workflow integration tests."""
     
+    @pytest.mark.ai
     @pytest.mark.asyncio
+    @pytest.mark.xdist_group("session_state")
     async def test_complete_bac_testing_workflow(self):
         """Test a complete BAC testing workflow using enhanced components."""
+        detector = pytest.importorskip("bac_hunter.intelligence.ai.enhanced_detection")
+        detect_vulnerabilities_with_ai = detector.detect_vulnerabilities_with_ai
+        generate_vulnerability_report = detector.generate_vulnerability_report
+        
         # This would be a comprehensive test that exercises multiple components
         # in a realistic scanning scenario
         
         # Mock target responses
-        responses = [
-            {
-                'url': 'https://api.example.com/users/123',
-                'status_code': 200,
-                'headers': {'content-type': 'application/json'},
-                'body': '{"user_id": 123, "email": "test@example.com"}',
-                'request_headers': {'Authorization': 'Bearer token123'}
-            },
-            {
-                'url': 'https://api.example.com/admin/dashboard',
-                'status_code': 200,
-                'headers': {'content-type': 'text/html'},
-                'body': '<h1>Admin Panel</h1>',
-                'request_headers': {'Cookie': 'session=user123'}
-            }
-        ]
+        responses = list(_E2E_RESPONSES)
         
         # Test AI vulnerability detection
-        from bac_hunter.intelligence.ai.enhanced_detection import detect_vulnerabilities_with_ai
-        
         context = {
             'application_type': 'api',
             'environment': 'production'
@@ -459,8 +511,6 @@ class TestEndToEndWorkflows:
         assert isinstance(findings, list)
         
         # Test report generation
-        from bac_hunter.intelligence.ai.enhanced_detection import generate_vulnerability_report
-        
         if findings:
             report = generate_vulnerability_report(findings)
             assert report['total_findings'] == len(findings)
@@ -487,31 +537,14 @@ class TestEndToEndWorkflows:
             
     def test_configuration_integration(self):
         """Test that enhanced features work with configuration."""
-        # Test that components can be configured together
-        config = {
-            'performance': {
-                'max_rps': 2.0,
-                'enable_adaptive_throttle': True,
-                'enable_waf_detection': True
-            },
-            'session': {
-                'enable_semi_auto_login': False,
-                'max_login_retries': 2,
-                'login_timeout_seconds': 30
-            },
-            'intelligence': {
-                'enable_ai_analysis': True,
-                'enable_anomaly_detection': True
-            }
-        }
-        
         # Components should accept configuration
+        session_config = _CONFIG['session']
         sm = SessionManager()
         sm.configure(
             sessions_dir="/tmp/test_sessions",
-            max_login_retries=config['session']['max_login_retries'],
-            login_timeout_seconds=config['session']['login_timeout_seconds'],
-            enable_semi_auto_login=config['session']['enable_semi_auto_login']
+            max_login_retries=session_config['max_login_retries'],
+            login_timeout_seconds=session_config['login_timeout_seconds'],
+            enable_semi_auto_login=session_config['enable_semi_auto_login']
         )
         
         # Verify configuration applied
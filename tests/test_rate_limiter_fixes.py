@@ -5,15 +5,44 @@ Unit tests for rate limiter fixes to prevent infinite loops.
 import pytest
 import asyncio
 import time
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 # Import the modules to test
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bac_hunter'))
-
 from bac_hunter.rate_limiter import TokenBucket, RateLimiter, AdaptiveRateLimiter
 
+_real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """Virtual clock: sleeping advances time instantly instead of waiting."""
+    
+    def __init__(self, start: float = 1000.0):
+        self._start = start
+        self.current = start
+    
+    def now(self) -> float:
+        return self.current
+    
+    async def sleep(self, delay, result=None):
+        self.current += max(0.0, delay)
+        # Still yield to the loop so concurrent tasks interleave as usual
+        await _real_sleep(0)
+        return result
+    
+    @property
+    def virtual_elapsed(self) -> float:
+        return self.current - self._start
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Drive the rate limiter's clock and sleeps from a FakeClock."""
+    clock = FakeClock()
+    monkeypatch.setattr("bac_hunter.rate_limiter.time.perf_counter", clock.now)
+    monkeypatch.setattr("bac_hunter.rate_limiter.asyncio.sleep", clock.sleep)
+    return clock
+
 
 class TestTokenBucketFixes:
     """Test fixes for infinite loop issues in TokenBucket."""
@@ -27,11 +56,16 @@ class TestTokenBucketFixes:
     async def test_timeout_protection(self, token_bucket):
         """Test that timeout protection prevents infinite loops."""
         # Mock time.perf_counter to simulate long wait
-        with patch('time.perf_counter') as mock_time:
-            mock_time.side_effect = [0.0, 0.0, 35.0, 35.0]  # Exceed 30s timeout
+        with patch('time.perf_counter') as mock_time, \
+                patch('bac_hunter.rate_limiter.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+            mock_time.side_effect = [0.0, 35.0]  # Exceed 30s timeout
             
             # This should not hang due to timeout protection
-            await token_bucket.take(5.0)
+            await token_bucket.take(50.0)
+            
+            # A single wait, bounded by max_wait_time
+            mock_sleep.assert_awaited_once()
+            assert mock_sleep.await_args.args[0] <= token_bucket.max_wait_time
             
             # Verify that tokens were forced to prevent infinite loop
             assert token_bucket.tokens >= 0
@@ -78,9 +112,13 @@ class TestRateLimiterFixes:
             await rate_limiter.acquire("test.com")
             return True
         
-        # Run multiple concurrent requests
-        tasks = [make_request() for _ in range(5)]
-        results = await asyncio.gather(*tasks)
+        # Run multiple concurrent requests (TaskGroup needs Python 3.11+)
+        if hasattr(asyncio, "TaskGroup"):
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(make_request()) for _ in range(5)]
+            results = [t.result() for t in tasks]
+        else:
+            results = await asyncio.gather(*(make_request() for _ in range(5)))
         
         # All requests should complete successfully
         assert all(results)
@@ -104,16 +142,14 @@ class TestAdaptiveRateLimiterFixes:
     @pytest.fixture
     def adaptive_limiter(self):
         """Create an adaptive rate limiter for testing."""
-        calibrator = Mock()
-        calibrator.current_rps = 3.0
+        calibrator = SimpleNamespace(current_rps=3.0)
         return AdaptiveRateLimiter(5.0, 2.5, calibrator)
     
     @pytest.mark.asyncio
     async def test_circuit_breaker_protection(self, adaptive_limiter):
         """Test that circuit breaker prevents infinite backoff."""
         # Simulate multiple failures
-        for _ in range(6):  # Exceed circuit breaker threshold
-            adaptive_limiter.report_response("test.com", 429)
+        adaptive_limiter.report_response("test.com", 429, count=6)  # Exceed circuit breaker threshold
         
         # Should trigger circuit breaker
         assert "test.com" in adaptive_limiter._emergency_throttle
@@ -140,8 +176,7 @@ class TestAdaptiveRateLimiterFixes:
     async def test_health_tracking(self, adaptive_limiter):
         """Test that health tracking works correctly."""
         # Simulate success streak
-        for _ in range(25):  # Exceed success threshold
-            adaptive_limiter.report_response("test.com", 200)
+        adaptive_limiter.report_responses("test.com", [200] * 25)  # Exceed success threshold
         
         # Should reduce block count
         health = adaptive_limiter._host_health["test.com"]
@@ -152,13 +187,50 @@ class TestAdaptiveRateLimiterFixes:
         
         # Should reset success streak
         assert adaptive_limiter._host_health["test.com"]["success_streak"] == 0
+    
+    def test_block_window_expires_old_blocks(self, adaptive_limiter):
+        """Test that only recent blocks count towards emergency throttling."""
+        with patch('time.perf_counter', return_value=0.0):
+            adaptive_limiter.report_responses("test.com", [429, 429])
+        with patch('time.perf_counter', return_value=100.0):
+            adaptive_limiter.report_response("test.com", 429)
+        
+        health = adaptive_limiter._host_health["test.com"]
+        assert health["blocks"] == 3
+        assert len(health["block_ts"]) == 1
+        assert "test.com" not in adaptive_limiter._emergency_throttle
+    
+    def test_batch_report_matches_sequential(self, adaptive_limiter):
+        """Test that batched reporting matches per-response reporting."""
+        statuses = [429, 403, 200, 500, 429, 403] + [200] * 12 + [503]
+        
+        for status in statuses:
+            adaptive_limiter.report_response("seq.com", status)
+        adaptive_limiter.report_responses("batch.com", statuses)
+        
+        seq = adaptive_limiter._host_health["seq.com"]
+        batch = adaptive_limiter._host_health["batch.com"]
+        assert batch["blocks"] == seq["blocks"]
+        assert batch["success_streak"] == seq["success_streak"]
+        assert ("batch.com" in adaptive_limiter._emergency_throttle) == ("seq.com" in adaptive_limiter._emergency_throttle)
+    
+    def test_report_response_count(self, adaptive_limiter):
+        """Test that count= matches repeated single reports."""
+        for _ in range(12):
+            adaptive_limiter.report_response("seq.com", 200)
+        adaptive_limiter.report_response("batch.com", 200, count=12)
+        
+        seq = adaptive_limiter._host_health["seq.com"]
+        batch = adaptive_limiter._host_health["batch.com"]
+        assert batch["success_streak"] == seq["success_streak"] == 12
+        assert batch["blocks"] == seq["blocks"]
 
 
 class TestIntegrationFixes:
     """Integration tests for rate limiter fixes."""
     
     @pytest.mark.asyncio
-    async def test_end_to_end_rate_limiting(self):
+    async def test_end_to_end_rate_limiting(self, fake_clock):
         """Test end-to-end rate limiting without infinite loops."""
         limiter = AdaptiveRateLimiter(1.0, 0.5, Mock())
         
@@ -169,12 +241,12 @@ class TestIntegrationFixes:
                 await asyncio.sleep(0.1)
         
         # Should complete without hanging
-        start_time = time.perf_counter()
         await stress_test()
-        elapsed = time.perf_counter() - start_time
         
+        # Token bucket waits were scheduled, but only on the virtual clock
+        assert fake_clock.virtual_elapsed > 1.0
         # Should complete in reasonable time
-        assert elapsed < 30.0  # Much less than potential infinite wait
+        assert fake_clock.virtual_elapsed < 30.0  # Much less than potential infinite wait
     
     @pytest.mark.asyncio
     async def test_waf_integration(self):
@@ -2,42 +2,50 @@
 Unit tests for session manager fixes to prevent infinite retry loops.
 """
 
+import copy
 import pytest
 import asyncio
+import itertools
+import threading
 import time
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 
-# Import the modules to test
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bac_hunter'))
+from bac_hunter.session_manager import SessionManager, AUTH_FAILED, LOGIN_UNAVAILABLE
 
-from bac_hunter.session_manager import SessionManager
+
+@pytest.fixture(scope="module")
+def configured_session_manager():
+    """Configure one session manager per module; tests get deep copies."""
+    sm = SessionManager()
+    sm.configure(
+        sessions_dir="/tmp/test_sessions",
+        browser_driver="playwright",
+        login_timeout_seconds=30,
+        enable_semi_auto_login=True,
+        max_login_retries=3,
+        overall_login_timeout_seconds=60
+    )
+    return sm
 
 
 class TestSessionManagerFixes:
     """Test fixes for infinite retry loop issues in SessionManager."""
     
     @pytest.fixture
-    def session_manager(self):
-        """Create a session manager for testing."""
-        sm = SessionManager()
-        sm.configure(
-            sessions_dir="/tmp/test_sessions",
-            browser_driver="playwright",
-            login_timeout_seconds=30,
-            enable_semi_auto_login=True,
-            max_login_retries=3,
-            overall_login_timeout_seconds=60
-        )
-        return sm
+    def session_manager(self, configured_session_manager):
+        """Fresh copy of the configured session manager for each test."""
+        base = configured_session_manager
+        # Locks cannot be deep-copied; copies share the browser bulkhead
+        # and get their own aggregate lock
+        memo = {id(base._browser_sem): base._browser_sem, id(base._aggregate_lock): threading.Lock()}
+        return copy.deepcopy(base, memo)
     
     def test_max_login_attempts_cap(self, session_manager):
         """Test that login attempts are capped to prevent infinite loops."""
         # Mock has_valid_session to always return False
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     # Should not exceed max attempts
                     result = session_manager.ensure_logged_in("test.com")
                     assert result is False
@@ -47,22 +55,23 @@ class TestSessionManagerFixes:
     
     def test_deadline_respect(self, session_manager):
         """Test that overall deadline is respected."""
-        # Mock time to simulate deadline exceeded
-        with patch.object(session_manager, '_now') as mock_time:
-            mock_time.side_effect = [0, 0, 0, 100]  # Exceed deadline
-            
+        # The deadline runs on the monotonic clock; jump past it after the first attempt
+        clock = itertools.chain([0, 0, 0, 0], itertools.repeat(1000))
+        with patch.object(session_manager, '_clock', side_effect=lambda: next(clock)):
             with patch.object(session_manager, 'has_valid_session', return_value=False):
-                with patch.object(session_manager, 'open_browser_login', return_value=False):
-                    with patch('time.sleep'):  # Skip actual delays
+                with patch.object(session_manager, '_aopen_browser_login', AsyncMock(return_value=False)) as mock_login:
+                    with patch('asyncio.sleep'):  # Skip actual delays
                         result = session_manager.ensure_logged_in("test.com")
-                        assert result is False
+        
+        assert result is False
+        assert mock_login.await_count == 1
     
     def test_circuit_breaker_activation(self, session_manager):
         """Test that circuit breaker activates after multiple failures."""
         # Mock has_valid_session to always return False
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     # First few attempts should proceed
                     for i in range(3):
                         result = session_manager.ensure_logged_in("test.com")
@@ -81,7 +90,7 @@ class TestSessionManagerFixes:
         # Mock initial failure
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     session_manager.ensure_logged_in("test.com")
         
         # Mock subsequent success
@@ -98,7 +107,7 @@ class TestSessionManagerFixes:
         # Mock failure to trigger backoff
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     session_manager.ensure_logged_in("test.com")
         
         # Mock success after backoff
@@ -109,12 +118,83 @@ class TestSessionManagerFixes:
             # Backoff should be reset
             assert "test.com" not in session_manager._login_backoff_until
     
+    def test_retry_backoff_is_capped(self, session_manager):
+        """Test that retry backoff stays within the configured cap."""
+        session_manager.configure(sessions_dir="/tmp/test_sessions", max_backoff_ms=1200)
+        for attempt in range(10):
+            delay = session_manager._compute_backoff(attempt)
+            assert 0.0 <= delay <= min(0.5 * (attempt + 1), 1.2)
+    
+    def test_non_retryable_login_error_fails_fast(self, session_manager):
+        """Test that permanent login errors stop retries and trip the breaker."""
+        with patch.object(session_manager, 'has_valid_session', return_value=False):
+            with patch.object(session_manager, 'open_browser_login', side_effect=ImportError("playwright")) as mock_login:
+                with patch('asyncio.sleep') as mock_sleep:
+                    result = session_manager.ensure_logged_in("test.com")
+        
+        assert result is False
+        assert mock_login.call_count == 2  # mock probe + one real attempt
+        mock_sleep.assert_not_called()
+        assert session_manager._login_circuit_breaker["test.com"] >= 3
+    
+    def test_browser_login_bulkhead(self, session_manager):
+        """Test that concurrent browser logins are capped."""
+        session_manager.configure(sessions_dir="/tmp/test_sessions", max_concurrent_logins=2)
+        active = peak = 0
+        lock = threading.Lock()
+        
+        def slow_login(url):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return True
+        
+        async def run_all():
+            return await asyncio.gather(*(session_manager._aopen_browser_login(f"t{i}.com") for i in range(6)))
+        
+        with patch.object(session_manager, 'open_browser_login', side_effect=slow_login):
+            results = asyncio.run(run_all())
+        
+        assert results == [True] * 6
+        assert peak <= 2
+    
+    def test_abandoned_login_skips_browser(self, session_manager):
+        """Test that a login cancelled while waiting for a bulkhead slot never opens a browser."""
+        session_manager.configure(sessions_dir="/tmp/test_sessions", max_concurrent_logins=1)
+        release = threading.Event()
+        opened = []
+        
+        def blocking_login(url):
+            opened.append(url)
+            release.wait(5)
+            return True
+        
+        async def run():
+            first = asyncio.ensure_future(session_manager._aopen_browser_login("a.com"))
+            while not opened:
+                await asyncio.sleep(0.01)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(session_manager._aopen_browser_login("b.com"), timeout=0.05)
+            release.set()
+            assert await first is True
+            # Let the abandoned worker take the slot and return
+            await asyncio.sleep(0.05)
+        
+        with patch.object(session_manager, 'open_browser_login', side_effect=blocking_login):
+            asyncio.run(run())
+        
+        assert opened == ["a.com"]
+    
     def test_prelogin_targets_graceful_failure(self, session_manager):
         """Test that prelogin_targets handles failures gracefully."""
         # Mock has_valid_session to always return False
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     # Should not crash on failure
                     session_manager.prelogin_targets(["test1.com", "test2.com"])
                     
@@ -122,6 +202,14 @@ class TestSessionManagerFixes:
                     assert "test1.com" in session_manager._login_circuit_breaker
                     assert "test2.com" in session_manager._login_circuit_breaker
     
+    def test_prelogin_targets_dedup_concurrent(self, session_manager):
+        """Test that prelogin dedupes domains and logs into them together."""
+        with patch.object(session_manager, 'aensure_logged_in', AsyncMock(return_value=True)) as mock_login:
+            results = asyncio.run(session_manager.aprelogin_targets(["https://a.com/x", "a.com", "b.com"]))
+        
+        assert results == [True, True]
+        assert [c.args[0] for c in mock_login.await_args_list] == ["a.com", "b.com"]
+    
     def test_session_validation_graceful(self, session_manager):
         """Test that session validation handles errors gracefully."""
         # Mock load_domain_session to raise exception
@@ -130,6 +218,16 @@ class TestSessionManagerFixes:
             result = session_manager.has_valid_session("test.com")
             assert result is False
     
+    def test_session_validity_cached_until_save(self, session_manager):
+        """Test that has_valid_session is cached briefly and invalidated on save."""
+        with patch.object(session_manager, 'load_domain_session', return_value={}) as mock_load:
+            assert session_manager.has_valid_session("cache.test") is False
+            assert session_manager.has_valid_session("cache.test") is False
+            assert mock_load.call_count == 1
+        
+        session_manager.save_domain_session("cache.test", [], "token", None, None)
+        assert session_manager.has_valid_session("cache.test") is True
+    
     def test_cookie_validation_edge_cases(self, session_manager):
         """Test cookie validation handles edge cases."""
         # Test with invalid cookie data
@@ -165,6 +263,50 @@ class TestSessionManagerFixes:
             # Should still save individual session
             assert "test.com" in session_manager._domain_sessions
 
+    
+    def test_aggregate_session_incremental(self, tmp_path):
+        """Test that the sessions directory is listed once and the aggregate updated per save."""
+        import json
+        sm = SessionManager()
+        sm.configure(sessions_dir=str(tmp_path))
+        sm.save_domain_session("a.com", [], "t1", None, None)
+        with patch('os.listdir', side_effect=AssertionError("rescanned")):
+            sm.save_domain_session("b.com:8443", [], "t2", None, None)
+        
+        aggregate = json.loads((tmp_path / "session.json").read_text())
+        assert set(aggregate) == {"a.com", "b.com_8443"}
+        assert aggregate["b.com_8443"]["bearer"] == "t2"
+    
+    def test_aggregate_keeps_sessions_saved_elsewhere(self, tmp_path):
+        """Test that a save does not overwrite other instances' sessions with stale copies."""
+        import json
+        first, second = SessionManager(), SessionManager()
+        first.configure(sessions_dir=str(tmp_path))
+        second.configure(sessions_dir=str(tmp_path))
+        first.save_domain_session("a.com", [], "old", None, None)
+        first.save_domain_session("b.com", [], "t1", None, None)
+        second.save_domain_session("a.com", [], "new", None, None)
+        first.save_domain_session("c.com", [], "t3", None, None)
+        
+        aggregate = json.loads((tmp_path / "session.json").read_text())
+        assert set(aggregate) == {"a.com", "b.com", "c.com"}
+        assert aggregate["a.com"]["bearer"] == "new"
+        assert first._domain_index == {"a.com", "b.com", "c.com"}
+    
+    def test_aggregate_concurrent_saves(self, tmp_path):
+        """Test that concurrent saves never lose domains or leave temp files behind."""
+        import json
+        from concurrent.futures import ThreadPoolExecutor
+        sm = SessionManager()
+        sm.configure(sessions_dir=str(tmp_path))
+        domains = [f"d{i}.com" for i in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda d: sm.save_domain_session(d, [], d, None, None), domains))
+        
+        aggregate = json.loads((tmp_path / "session.json").read_text())
+        assert set(aggregate) == set(domains)
+        assert not [p for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+
 
 class TestSessionManagerIntegration:
     """Integration tests for session manager fixes."""
@@ -174,7 +316,7 @@ class TestSessionManagerIntegration:
         # Mock successful login
         with patch.object(session_manager, 'open_browser_login', return_value=True):
             with patch.object(session_manager, 'has_valid_session', side_effect=[False, True]):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     result = session_manager.ensure_logged_in("test.com")
                     assert result is True
     
@@ -185,7 +327,7 @@ class TestSessionManagerIntegration:
         # Mock all logins to fail
         with patch.object(session_manager, 'has_valid_session', return_value=False):
             with patch.object(session_manager, 'open_browser_login', return_value=False):
-                with patch('time.sleep'):  # Skip actual delays
+                with patch('asyncio.sleep'):  # Skip actual delays
                     for target in targets:
                         result = session_manager.ensure_logged_in(target)
                         assert result is False
@@ -244,12 +386,50 @@ class TestSessionManagerErrorRecovery:
         session_manager.prelogin_targets(["test.com"])
         # Should complete without error
     
+    def test_offline_mode_skips_session_io(self, session_manager):
+        """Test that offline mode answers without session lookups or an event loop."""
+        session_manager._enable_semi_auto_login = False
+        with patch.object(session_manager, 'has_valid_session') as mock_valid, \
+                patch.object(session_manager, '_run_sync') as mock_run:
+            assert session_manager.ensure_logged_in("test.com") is False
+            session_manager.prelogin_targets(["test.com"])
+        
+        mock_valid.assert_not_called()
+        mock_run.assert_not_called()
+    
     def test_missing_dependencies_handling(self, session_manager):
         """Test handling of missing dependencies."""
         # Mock missing browser automation
         with patch('builtins.__import__', side_effect=ImportError("No module named 'playwright'")):
             result = session_manager.open_browser_login("test.com")
-            assert result is False
+            assert not result
+            assert result == LOGIN_UNAVAILABLE
+    
+    def test_missing_browser_automation_is_not_retried(self, session_manager):
+        """Test that a real missing browser stack trips the breaker without retries."""
+        missing = {
+            "bac_hunter.integrations.browser_automation": None,
+            "integrations.browser_automation": None,
+        }
+        with patch.dict("sys.modules", missing):
+            with patch.object(session_manager, 'has_valid_session', return_value=False):
+                with patch.object(session_manager, '_compute_backoff', wraps=session_manager._compute_backoff) as mock_backoff:
+                    result = session_manager.ensure_logged_in("test.com")
+        
+        assert result is False
+        mock_backoff.assert_not_called()
+        assert session_manager._login_circuit_breaker["test.com"] >= 3
+    
+    def test_denied_browser_login_is_not_retried(self, session_manager):
+        """Test that an AUTH_FAILED result stops retries like a missing dependency."""
+        assert not AUTH_FAILED
+        with patch.object(session_manager, 'has_valid_session', return_value=False):
+            with patch.object(session_manager, '_aopen_browser_login', AsyncMock(return_value=AUTH_FAILED)) as mock_login:
+                result = session_manager.ensure_logged_in("test.com")
+        
+        assert result is False
+        assert mock_login.call_count == 1
+        assert session_manager._login_circuit_breaker["test.com"] >= 3
     
     def test_file_permission_handling(self, session_manager):
         """Test handling of file permission issues."""
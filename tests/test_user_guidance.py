@@ -5,11 +5,6 @@ Unit tests for the user guidance system.
 import pytest
 from unittest.mock import Mock, patch
 
-# Import the modules to test
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bac_hunter'))
-
 from bac_hunter.user_guidance import (
     UserGuidanceSystem, ErrorCategory, 
     handle_error_with_guidance, get_contextual_help
@@ -19,24 +14,45 @@ from bac_hunter.user_guidance import (
 class TestUserGuidanceSystem:
     """Test the user guidance system functionality."""
     
-    @pytest.fixture
-    def guidance_system(self):
-        """Create a guidance system for testing."""
-        return UserGuidanceSystem()
-        
     def test_initialization(self, guidance_system):
         """Test that guidance system initializes properly."""
         assert guidance_system.error_patterns is not None
         assert guidance_system.solution_database is not None
         assert isinstance(guidance_system.context_hints, dict)
         
+    def test_tables_shared_by_instances(self):
+        """Test that instances read the shared module tables without copying them."""
+        gs = UserGuidanceSystem()
+        assert gs.error_patterns is UserGuidanceSystem().error_patterns
+        assert gs.categorize_error("connection refused") == ErrorCategory.NETWORK
+        assert gs._override_table is None
+        
+    def test_error_patterns_override_per_instance(self):
+        """Test that categorization uses the instance's own error patterns."""
+        gs = UserGuidanceSystem()
+        gs.error_patterns = {
+            ErrorCategory.NETWORK: ("flux capacitor",),
+            ErrorCategory.WAF_DETECTED: ("gatekeeper",),
+        }
+        assert gs.categorize_error("Flux capacitor overloaded") == ErrorCategory.NETWORK
+        assert gs.categorize_error("Connection timeout") == ErrorCategory.UNKNOWN
+        assert gs.categorize_error("blocked by gatekeeper", 403) == ErrorCategory.WAF_DETECTED
+        # A mapping assigned after first use takes effect too
+        gs.error_patterns = {ErrorCategory.DEPENDENCY: ("flux capacitor",)}
+        assert gs.categorize_error("Flux capacitor overloaded") == ErrorCategory.DEPENDENCY
+        # Other instances keep the default patterns
+        assert UserGuidanceSystem().categorize_error("Connection timeout") == ErrorCategory.NETWORK
+        
     def test_error_categorization_by_status_code(self, guidance_system):
         """Test error categorization based on status codes."""
         test_cases = [
             (401, ErrorCategory.AUTHENTICATION),
             (403, ErrorCategory.PERMISSION),
             (404, ErrorCategory.TARGET_UNREACHABLE),
-            (429, ErrorCategory.RATE_LIMITED)
+            (429, ErrorCategory.RATE_LIMITED),
+            (502, ErrorCategory.NETWORK),
+            (503, ErrorCategory.NETWORK),
+            (504, ErrorCategory.NETWORK)
         ]
         
         for status_code, expected_category in test_cases:
@@ -118,6 +134,14 @@ class TestUserGuidanceSystem:
             assert 'quick_fixes' in solution
             assert 'commands' in solution
             
+    def test_solution_database_shared_and_read_only(self, guidance_system):
+        """Test that the solution database is shared and cannot be mutated."""
+        assert UserGuidanceSystem().solution_database is guidance_system.solution_database
+        with pytest.raises(TypeError):
+            guidance_system.solution_database[ErrorCategory.NETWORK] = {}
+        with pytest.raises(TypeError):
+            guidance_system.solution_database[ErrorCategory.NETWORK]["quick_fixes"][0] = "x"
+            
     def test_comprehensive_guidance_generation(self, guidance_system):
         """Test generation of comprehensive guidance."""
         guidance = guidance_system.get_guidance(
@@ -143,6 +167,18 @@ class TestUserGuidanceSystem:
         assert len(guidance['next_steps']) > 0
         assert len(guidance['solutions']['quick_fixes']) > 0
         
+    def test_guidance_cached_and_read_only(self):
+        """Test that repeated errors are built once and share one read-only result."""
+        gs = UserGuidanceSystem()
+        with patch.object(gs, 'categorize_error', wraps=gs.categorize_error) as categorize:
+            first = gs.get_guidance("connection refused", None, "scan")
+            assert gs.get_guidance("connection refused", None, "scan") is first
+            assert gs.get_guidance("connection refused", None, "login") is not first
+        assert categorize.call_count == 2
+        with pytest.raises(TypeError):
+            first["severity"] = "high"
+        assert isinstance(first['next_steps'], tuple)
+        
     def test_cli_formatting(self, guidance_system):
         """Test CLI formatting of guidance."""
         guidance = guidance_system.get_guidance("network timeout", context="scan")
@@ -238,6 +274,15 @@ class TestGuidanceHelperFunctions:
             assert "Error: test error" in result
             assert "--help" in result
             
+    def test_guidance_system_created_lazily(self):
+        """Test that the shared guidance system is built on first use only."""
+        import bac_hunter.user_guidance as ug
+        with patch.object(ug, '_guidance_system', None):
+            assert ug._guidance_system is None
+            shared = ug.guidance_system
+            assert isinstance(shared, UserGuidanceSystem)
+            assert ug.guidance_system is shared
+            
     def test_get_contextual_help(self):
         """Test contextual help function."""
         help_content = get_contextual_help("scan")
@@ -256,6 +301,13 @@ class TestGuidanceHelperFunctions:
         assert "Interactive Login:" in help_content
         assert "Session Management:" in help_content
         
+    def test_get_contextual_help_shared_text(self):
+        """Test that contextual help returns the shared module text without rebuilding it."""
+        from bac_hunter.user_guidance import _HELP_CONTENT
+        assert get_contextual_help("scan") is _HELP_CONTENT["scan"]
+        assert get_contextual_help("SCAN") == "No specific help available for 'SCAN'"
+        assert get_contextual_help(None) == "No specific help available for 'None'"
+        
     def test_get_contextual_help_unknown_topic(self):
         """Test contextual help for unknown topic."""
         help_content = get_contextual_help("unknown_topic")
@@ -289,10 +341,6 @@ class TestErrorCategoryEnum:
 class TestGuidanceSystemIntegration:
     """Test integration scenarios for the guidance system."""
     
-    @pytest.fixture
-    def guidance_system(self):
-        return UserGuidanceSystem()
-        
     def test_authentication_error_workflow(self, guidance_system):
         """Test complete workflow for authentication errors."""
         # Simulate authentication error
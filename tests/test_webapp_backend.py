@@ -0,0 +1,291 @@
+"""
+Tests for the web backend (command discovery, run log storage and log streaming).
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+# The backend modules import each other as top-level modules, as they do when
+# the app is started from webapp/backend
+_BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "webapp", "backend")
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+from cli_analysis import SourceCodeAnalyzer  # noqa: E402
+
+CLI_SOURCE = '''
+import typer
+app = typer.Typer()
+
+@app.command()
+def scan(target: str = typer.Argument(..., help="URL"), max_rps: float = typer.Option(2.0, "--max-rps", help="Rate")):
+    """Scan a target."""
+
+@app.command(name="quick-check")
+def quick(url: str):
+    pass
+'''
+
+
+@pytest.fixture
+def cli_repo(tmp_path):
+    pkg = tmp_path / "repo" / "bac_hunter"
+    pkg.mkdir(parents=True)
+    (pkg / "cli.py").write_text(CLI_SOURCE)
+    return str(tmp_path / "repo")
+
+
+class TestSourceCodeAnalyzer:
+    """Test command discovery from the CLI source."""
+
+    def test_ellipsis_argument_is_required(self, cli_repo, tmp_path):
+        scan = SourceCodeAnalyzer(cli_repo, cache_dir=str(tmp_path / "cache")).analyze()[0]
+        target, max_rps = scan.parameters
+        assert (target.kind, target.required, target.default, target.help) == ("argument", True, None, "URL")
+        assert (max_rps.kind, max_rps.default, max_rps.flags) == ("option", 2.0, ["--max-rps"])
+
+
+class TestParameterFlags:
+    """Test that CLI flag spellings are derived from the name and stay internal."""
+
+    def test_flags_ignore_input_and_are_not_serialized(self):
+        from models import Parameter
+        p = Parameter.model_validate({"name": "max_rps", "kind": "option", "long_flag": "--evil", "no_flag": "--evil"})
+        assert (p.long_flag, p.no_flag) == ("--max-rps", "--no-max-rps")
+        assert "long_flag" not in p.model_dump() and "no_flag" not in p.model_dump()
+        assert "long_flag" not in Parameter.model_json_schema()["properties"]
+
+
+class TestCommandCache:
+    """Test the on-disk cache of discovered commands."""
+
+    def test_cache_is_json_in_private_dir(self, cli_repo, tmp_path):
+        cache_dir = tmp_path / "cache"
+        commands = SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir)).analyze()
+        assert [c.name for c in commands] == ["scan", "quick-check"]
+
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+        files = os.listdir(cache_dir)
+        assert len(files) == 1 and files[0].endswith(".json")
+        with open(cache_dir / files[0]) as f:
+            assert json.load(f)[0]["name"] == "scan"
+
+        # A fresh analyzer is served from the cache and sees the same commands
+        again = SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir))
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(again, "_analyze_source", lambda src: pytest.fail("cache not used"))
+            assert again.analyze() == commands
+
+    def test_corrupt_cache_is_rebuilt(self, cli_repo, tmp_path):
+        cache_dir = tmp_path / "cache"
+        analyzer = SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir))
+        expected = analyzer.analyze()
+        path = cache_dir / os.listdir(cache_dir)[0]
+        path.write_text("not json")
+        assert SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir)).analyze() == expected
+
+    def test_shared_writable_dir_is_not_used(self, cli_repo, tmp_path):
+        cache_dir = tmp_path / "shared"
+        cache_dir.mkdir()
+        os.chmod(cache_dir, 0o777)
+        SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir)).analyze()
+        assert os.listdir(cache_dir) == []
+
+    @pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="needs root to chown")
+    def test_foreign_cache_file_is_ignored(self, cli_repo, tmp_path):
+        cache_dir = tmp_path / "cache"
+        analyzer = SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir))
+        analyzer.analyze()
+        path = cache_dir / os.listdir(cache_dir)[0]
+        planted = json.loads(path.read_text())
+        planted[0]["name"] = "planted"
+        path.write_text(json.dumps(planted))
+        os.chown(path, 65534, 65534)
+        commands = SourceCodeAnalyzer(cli_repo, cache_dir=str(cache_dir)).analyze()
+        assert "planted" not in [c.name for c in commands]
+
+
+class TestStatRevalidation:
+    """Test that unchanged cli.py is not re-read and edits are picked up."""
+
+    def test_unchanged_file_returns_same_list(self, cli_repo, tmp_path):
+        analyzer = SourceCodeAnalyzer(cli_repo, cache_dir=str(tmp_path / "cache"))
+        first = analyzer.analyze()
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(analyzer, "_load_commands", lambda: pytest.fail("cli.py re-read"))
+            assert analyzer.analyze() is first
+
+    def test_edit_is_picked_up(self, cli_repo, tmp_path):
+        analyzer = SourceCodeAnalyzer(cli_repo, cache_dir=str(tmp_path / "cache"))
+        first = analyzer.analyze()
+        with open(analyzer.cli_path, "a") as f:
+            f.write("\n@app.command()\ndef brand_new(x: int):\n    pass\n")
+        second = analyzer.analyze()
+        assert second is not first
+        assert [c.name for c in second] == ["scan", "quick-check", "brand-new"]
+
+
+class TestRunManager:
+    """Test run log storage with the in-memory tail and disk spill."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        from run_manager import RunManager
+        return RunManager(log_dir=str(tmp_path / "logs"), max_memory_bytes=1000)
+
+    @staticmethod
+    def _fill(manager, run_id="r1", chunks=200):
+        data = bytearray()
+        manager.create(run_id, "scan", [])
+        for i in range(chunks):
+            chunk = bytes([i % 251]) * (1 + (i * 37) % 97)
+            manager.append(run_id, chunk)
+            data += chunk
+        return bytes(data)
+
+    def test_reads_across_spill_boundary(self, manager):
+        data = self._fill(manager)
+        base = manager._base_offset["r1"]
+        assert base > 0
+        assert sum(map(len, manager._chunks["r1"])) <= 1250
+        assert manager.size("r1") == len(data) == manager.get("r1").last_log_offset
+
+        for offset in (0, base - 10, base - 1, base, base + 1, len(data) - 5, len(data)):
+            for max_bytes in (1, 7, 64, 5000):
+                assert manager.read_from("r1", offset, max_bytes) == data[offset:offset + max_bytes]
+
+    def test_sequential_read_returns_every_byte(self, manager):
+        data = self._fill(manager)
+        for completed in (False, True):
+            if completed:
+                # Spilled ranges are then served by reopening the log file
+                manager.complete("r1", 0)
+            out, offset = b"", 0
+            while True:
+                chunk = manager.read_from("r1", offset, 333)
+                if not chunk:
+                    break
+                out += chunk
+                offset += len(chunk)
+            assert out == data
+
+    def test_remove_deletes_spilled_log(self, manager, tmp_path):
+        self._fill(manager)
+        manager.complete("r1", 0)
+        log_file = tmp_path / "logs" / "r1.log"
+        assert log_file.exists()
+        manager.remove("r1")
+        assert not log_file.exists()
+        assert manager.get("r1") is None
+        assert manager.read_from("r1", 0) == b""
+
+    def test_oldest_finished_runs_are_evicted(self, tmp_path):
+        from run_manager import RunManager
+        manager = RunManager(log_dir=str(tmp_path), max_runs=3)
+        manager.create("active", "scan", [])
+        for run_id in ("old", "newer"):
+            manager.create(run_id, "scan", [])
+            manager.append(run_id, b"x")
+            manager.complete(run_id, 0)
+        manager.create("latest", "scan", [])
+        # Only finished runs are evicted, oldest first, with their logs
+        assert manager.get("old") is None and not (tmp_path / "old.log").exists()
+        assert manager.get("active") is not None and manager.get("newer") is not None
+        manager.remove_all()
+        assert os.listdir(tmp_path) == []
+
+    def test_unwritable_log_dir_keeps_everything_in_memory(self, tmp_path):
+        from run_manager import RunManager
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        manager = RunManager(log_dir=str(blocker / "logs"), max_memory_bytes=100)
+        data = self._fill(manager)
+        assert manager._base_offset["r1"] == 0
+        assert manager.read_from("r1", 0, len(data)) == data
+
+
+@pytest.fixture
+def backend_app():
+    pytest.importorskip("fastapi")
+    import app
+    return app
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(text)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestRunLogWebSocket:
+    """Test that the log WebSocket is driven by RunManager events."""
+
+    def test_pushes_appends_and_exits_on_complete(self, backend_app, tmp_path, monkeypatch):
+        from run_manager import RunManager
+        manager = RunManager(log_dir=str(tmp_path))
+        monkeypatch.setattr(backend_app, "run_manager", manager)
+
+        async def scenario():
+            manager.create("r1", "scan", [])
+            listeners = [_FakeWebSocket(), _FakeWebSocket()]
+            tasks = [asyncio.ensure_future(backend_app.ws_run_logs(ws, "r1")) for ws in listeners]
+            await asyncio.sleep(0)
+            manager.append("r1", b"one\n")
+            await asyncio.sleep(0)
+            # Delivered on append, without waiting for a polling interval
+            assert all("".join(ws.sent) == "one\n" for ws in listeners)
+            manager.append("r1", b"two\n")
+            manager.complete("r1", 0)
+            await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+            return listeners
+
+        listeners = asyncio.run(scenario())
+        for ws in listeners:
+            assert "".join(ws.sent) == "one\ntwo\n"
+            assert ws.closed
+
+    def test_unknown_run_closes_socket(self, backend_app):
+        ws = _FakeWebSocket()
+        asyncio.run(asyncio.wait_for(backend_app.ws_run_logs(ws, "missing"), timeout=1))
+        assert ws.closed and ws.sent == []
+
+
+class TestQueryCache:
+    """Test the short-lived cache in front of the DB listing endpoints."""
+
+    def test_identical_queries_share_one_result(self, backend_app):
+        cachetools = pytest.importorskip("cachetools")
+        now = [0.0]
+        cache = cachetools.TTLCache(maxsize=8, ttl=2.0, timer=lambda: now[0])
+        calls = []
+
+        def query():
+            calls.append(1)
+            return [len(calls)]
+
+        assert backend_app._cached_query(cache, ("t", 100, 0), query) == [1]
+        assert backend_app._cached_query(cache, ("t", 100, 0), query) == [1]
+        assert backend_app._cached_query(cache, ("t", 50, 0), query) == [2]
+        now[0] = 2.5
+        assert backend_app._cached_query(cache, ("t", 100, 0), query) == [3]
+
+    def test_without_cache_every_call_queries(self, backend_app):
+        calls = []
+        for _ in range(2):
+            backend_app._cached_query(None, "all", lambda: calls.append(1))
+        assert len(calls) == 2
@@ -2,16 +2,18 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import threading
+from contextlib import asynccontextmanager
 from typing import Dict, List
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from cli_analysis import SourceCodeAnalyzer
 from command_executor import CommandExecutor
-from models import DiscoveredCommand, ExecuteRequest, ExecuteResponse, RunStatus
+from models import DiscoveredCommand, ExecuteRequest, ExecuteResponse
 from run_manager import run_manager
 
 # BAC Hunter imports (DB/session exposure)
@@ -20,7 +22,32 @@ from bac_hunter.storage import Storage
 from bac_hunter.session_manager import SessionManager
 from bac_hunter.orchestrator import JobStore
 
-app = FastAPI(title="BAC Hunter Web API", version="1.0.0")
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+except ImportError:
+    _DefaultResponse = JSONResponse
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Discover commands before serving traffic, off the event loop, so the first
+    # /api/commands or execute request does not parse cli.py inline
+    try:
+        await asyncio.to_thread(_ensure_commands)
+    except Exception:
+        # Leave it to the endpoints to surface the problem on first use
+        pass
+    yield
+    # Runs live in memory only, so their log files are unreachable after shutdown
+    run_manager.remove_all()
+
+
+app = FastAPI(title="BAC Hunter Web API", version="1.0.0", default_response_class=_DefaultResponse, lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -37,22 +64,30 @@ if os.path.isdir(_static_dir):
 _analyzer = SourceCodeAnalyzer("/workspace")
 _executor = CommandExecutor()
 _commands_cache: List[DiscoveredCommand] | None = None
+_commands_by_name: Dict[str, DiscoveredCommand] | None = None
+
+
+def _ensure_commands() -> Dict[str, DiscoveredCommand]:
+    global _commands_cache, _commands_by_name
+    # analyze() only stats cli.py when it is unchanged and then returns the same
+    # list, so edits are picked up without re-parsing on every request
+    commands = _analyzer.analyze()
+    if _commands_by_name is None or commands is not _commands_cache:
+        # Publish the index last so callers never see a list without its lookup table
+        _commands_cache = commands
+        _commands_by_name = {c.name: c for c in commands}
+    return _commands_by_name
 
 
 @app.get("/api/commands", response_model=List[DiscoveredCommand])
 async def list_commands():
-    global _commands_cache
-    if _commands_cache is None:
-        _commands_cache = _analyzer.analyze()
+    _ensure_commands()
     return _commands_cache
 
 
 @app.post("/api/commands/{name}/execute", response_model=ExecuteResponse)
 async def execute_command(name: str, req: ExecuteRequest):
-    global _commands_cache
-    if _commands_cache is None:
-        _commands_cache = _analyzer.analyze()
-    selected = next((c for c in _commands_cache if c.name == name), None)
+    selected = _ensure_commands().get(name)
     if not selected:
         raise HTTPException(status_code=404, detail="Command not found")
 
@@ -64,59 +99,81 @@ async def execute_command(name: str, req: ExecuteRequest):
 
     async def _pump():
         try:
-            assert proc.stdout and proc.stderr
+            assert proc.stdout
+            # Forward raw chunks; line breaks are already in the byte stream
             while True:
-                line = await proc.stdout.readline()
-                if not line:
+                chunk = await proc.stdout.read(65536)
+                if not chunk:
                     break
-                run_manager.append(run_id, line)
-            err = await proc.stderr.read()
-            if err:
-                run_manager.append(run_id, err)
+                run_manager.append(run_id, chunk)
             rc = await proc.wait()
             run_manager.complete(run_id, rc)
         except Exception as e:
             run_manager.append(run_id, f"[executor-error] {e}\n".encode())
             run_manager.complete(run_id, 1)
 
-    asyncio.create_task(_pump())
+    # Keep a reference so the pump cannot be garbage-collected mid-run
+    run_manager.set_task(run_id, asyncio.create_task(_pump()))
     return ExecuteResponse(run_id=run_id, command=selected.name, args=args)
 
 
-@app.get("/api/runs", response_model=List[RunStatus])
+# Run entries are already RunStatus models, so they are dumped directly instead
+# of being revalidated through a response_model on every poll
+@app.get("/api/runs")
 async def list_runs():
     # simple snapshot
-    return list(run_manager._runs.values())
+    return [r.model_dump() for r in run_manager._runs.values()]
 
 
-@app.get("/api/runs/{run_id}", response_model=RunStatus)
+@app.get("/api/bootstrap")
+async def bootstrap():
+    # Everything the UI needs on page load in one round-trip; the individual
+    # endpoints above remain available
+    _ensure_commands()
+    return {
+        "commands": [c.model_dump() for c in _commands_cache],
+        "runs": [r.model_dump() for r in run_manager._runs.values()],
+    }
+
+
+@app.get("/api/runs/{run_id}")
 async def get_run(run_id: str):
     st = run_manager.get(run_id)
     if not st:
         raise HTTPException(status_code=404, detail="Run not found")
-    return st
+    return st.model_dump()
 
 
 @app.get("/api/runs/{run_id}/logs")
 async def get_run_logs(run_id: str, offset: int = 0):
     data = run_manager.read_from(run_id, offset)
-    return JSONResponse({"offset": offset + len(data), "data": data.decode(errors="ignore")})
+    return _DefaultResponse({"offset": offset + len(data), "data": data.decode(errors="ignore")})
 
 
 @app.websocket("/ws/runs/{run_id}")
 async def ws_run_logs(ws: WebSocket, run_id: str):
     await ws.accept()
     last = 0
+    ev = run_manager.get_event(run_id)
     try:
+        if ev is None:
+            return
         while True:
-            await asyncio.sleep(0.5)
-            data = run_manager.read_from(run_id, last)
-            if data:
+            while last < run_manager.size(run_id):
+                data = run_manager.read_from(run_id, last)
+                if not data:
+                    break
                 await ws.send_text(data.decode(errors="ignore"))
                 last += len(data)
             st = run_manager.get(run_id)
             if st and st.status in ("completed", "failed", "canceled") and last >= (st.last_log_offset or 0):
                 break
+            # Clear before re-checking so an append between the two cannot be missed;
+            # append() and complete() set the event to wake every listener
+            ev.clear()
+            if last < run_manager.size(run_id):
+                continue
+            await ev.wait()
     except WebSocketDisconnect:
         return
     except Exception:
@@ -128,49 +185,117 @@ async def ws_run_logs(ws: WebSocket, run_id: str):
             pass
 
 
+# Shared backends, built on first use and reused by every request. Storage and
+# JobStore open a short-lived connection per operation, so one instance is safe
+# to share across threadpool workers.
+_backend_lock = threading.Lock()
+_settings: Settings | None = None
+_storage: Storage | None = None
+_jobstore: JobStore | None = None
+_session_manager: SessionManager | None = None
+
+
+def get_settings() -> Settings:
+    global _settings
+    if _settings is None:
+        with _backend_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+def get_storage() -> Storage:
+    global _storage
+    if _storage is None:
+        s = get_settings()
+        with _backend_lock:
+            if _storage is None:
+                _storage = Storage(s.db_path)
+    return _storage
+
+
+def get_jobstore() -> JobStore:
+    global _jobstore
+    if _jobstore is None:
+        s = get_settings()
+        with _backend_lock:
+            if _jobstore is None:
+                _jobstore = JobStore(s.db_path)
+    return _jobstore
+
+
+def get_session_manager() -> SessionManager:
+    global _session_manager
+    if _session_manager is None:
+        s = get_settings()
+        with _backend_lock:
+            if _session_manager is None:
+                sm = SessionManager()
+                sm.configure(sessions_dir=s.sessions_dir)
+                sm.initialize_from_persistent_store()
+                _session_manager = sm
+    return _session_manager
+
+
+# Dashboards poll the DB listings from several tabs at once; identical queries
+# within a couple of seconds share one result. Without cachetools every call hits the DB.
+_query_cache_lock = threading.Lock()
+_findings_cache = TTLCache(maxsize=256, ttl=2.0) if TTLCache else None
+_targets_cache = TTLCache(maxsize=1, ttl=2.0) if TTLCache else None
+_MISS = object()
+
+
+def _cached_query(cache, key, compute):
+    if cache is None:
+        return compute()
+    with _query_cache_lock:
+        hit = cache.get(key, _MISS)
+    if hit is not _MISS:
+        return hit
+    value = compute()
+    with _query_cache_lock:
+        cache[key] = value
+    return value
+
+
+# Handlers backed by blocking SQLite/file I/O are plain ``def`` so FastAPI runs
+# them in its threadpool instead of stalling the event loop (and the log pumps).
 @app.get("/api/db/findings")
-async def list_findings(limit: int = 100, offset: int = 0, target: str | None = None):
-    s = Settings()
-    db = Storage(s.db_path)
-    tid = None
-    if target:
-        tid = db.ensure_target(target)
-    rows = db.get_findings(tid, limit=limit, offset=offset)
-    return rows
+def list_findings(limit: int = 100, offset: int = 0, target: str | None = None, db: Storage = Depends(get_storage)):
+    def _query():
+        tid = None
+        if target:
+            tid = db.ensure_target(target)
+        return db.get_findings(tid, limit=limit, offset=offset)
+
+    return _cached_query(_findings_cache, (target, limit, offset), _query)
 
 
 @app.get("/api/db/targets")
-async def list_targets():
-    s = Settings()
-    db = Storage(s.db_path)
-    found = []
-    with db.conn() as c:
-        for row in c.execute("SELECT id, base_url, name FROM targets ORDER BY id DESC"):
-            found.append({"id": row[0], "base_url": row[1], "name": row[2]})
-    return found
+def list_targets(db: Storage = Depends(get_storage)):
+    def _query():
+        found = []
+        with db.conn() as c:
+            for row in c.execute("SELECT id, base_url, name FROM targets ORDER BY id DESC"):
+                found.append({"id": row[0], "base_url": row[1], "name": row[2]})
+        return found
+
+    return _cached_query(_targets_cache, "all", _query)
 
 
 @app.get("/api/sessions/{base}")
-async def session_info(base: str):
-    s = Settings()
-    sm = SessionManager()
-    sm.configure(sessions_dir=s.sessions_dir)
-    sm.initialize_from_persistent_store()
+def session_info(base: str, sm: SessionManager = Depends(get_session_manager)):
     return sm.get_session_info(base)
 
 
 @app.post("/api/orchestrator/enqueue")
-async def enqueue_task(job_type: str, target: str, priority: int = 0):
-    s = Settings()
-    js = JobStore(s.db_path)
+def enqueue_task(job_type: str, target: str, priority: int = 0, js: JobStore = Depends(get_jobstore)):
     jid = js.enqueue_job(job_type, {"target": target}, priority=priority)
     return {"job_id": jid}
 
 
 @app.get("/api/orchestrator/status")
-async def orchestrator_status():
-    s = Settings()
-    js = JobStore(s.db_path)
+def orchestrator_status(js: JobStore = Depends(get_jobstore)):
     return js.get_status()
 
 
@@ -1,11 +1,94 @@
 from __future__ import annotations
 import ast
+import hashlib
+import json
 import os
+import stat
+import sys
+import tempfile
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import models
 from models import DiscoveredCommand, Parameter
 
+def _analyzer_digest() -> str:
+    # Cached results are only valid for the analyzer and models that produced them
+    h = hashlib.sha256()
+    try:
+        for path in (__file__, models.__file__):
+            with open(path, "rb") as f:
+                h.update(f.read())
+    except (OSError, TypeError):
+        return "0"
+    return h.hexdigest()[:12]
+
+
+_ANALYZER_DIGEST = _analyzer_digest()
+
+
+def _default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "bac_hunter")
+
+
+def _owned_by_us(st: os.stat_result) -> bool:
+    getuid = getattr(os, "getuid", None)
+    return getuid is None or st.st_uid == getuid()
+
+
+def _private_cache_dir(path: Optional[str]) -> Optional[str]:
+    """Return a cache directory only we can write to, or None to skip caching."""
+    path = path or os.environ.get("BH_CACHE_DIR") or _default_cache_dir()
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError:
+        return None
+    # Refuse symlinks, foreign owners and group/world-writable directories
+    if not stat.S_ISDIR(st.st_mode) or not _owned_by_us(st) or st.st_mode & 0o022:
+        return None
+    return path
+
+
+def _read_cache(path: str) -> Optional[List[DiscoveredCommand]]:
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, "rb") as f:
+            if not _owned_by_us(os.fstat(f.fileno())):
+                return None
+            return [DiscoveredCommand.model_validate(d) for d in json.load(f)]
+    except Exception:
+        # Corrupt or written by an incompatible build; rebuild instead
+        return None
+
+
+def _write_cache(path: str, commands: List[DiscoveredCommand]) -> None:
+    try:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump([c.model_dump() for c in commands], f)
+        os.replace(tmp, path)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+# AST node types are never subclassed, so exact type checks against local aliases
+# are the cheapest way to test them on the discovery path
+_Attribute = ast.Attribute
+_Call = ast.Call
+_Constant = ast.Constant
+_Expr = ast.Expr
+_Name = ast.Name
+
 
 @dataclass
 class _ParamInfo:
@@ -19,13 +102,50 @@ class _ParamInfo:
 
 
 class SourceCodeAnalyzer:
-    def __init__(self, repo_root: str = "/workspace"):
+    def __init__(self, repo_root: str = "/workspace", cache_dir: Optional[str] = None):
         self.repo_root = repo_root
+        self.cache_dir = cache_dir
         self.cli_path = os.path.join(repo_root, "bac_hunter", "cli.py")
+        self._ann_cache: Dict[str, str] = {}
+        # (st_mtime_ns, st_size) of cli.py when _commands was produced
+        self._cli_stat: Optional[Tuple[int, int]] = None
+        self._commands: Optional[List[DiscoveredCommand]] = None
+
+    def _cache_path(self, src: bytes) -> Optional[str]:
+        cache_dir = _private_cache_dir(self.cache_dir)
+        if cache_dir is None:
+            return None
+        digest = hashlib.sha256(src).hexdigest()
+        py = "%d%d" % sys.version_info[:2]
+        return os.path.join(cache_dir, f"cli_{digest}_{_ANALYZER_DIGEST}_py{py}.json")
 
     def analyze(self) -> List[DiscoveredCommand]:
-        with open(self.cli_path, "r", encoding="utf-8") as f:
-            src = f.read()
+        # An unchanged stat means an unchanged file: skip reading and hashing it.
+        # Returns the same list object until cli.py changes.
+        st = os.stat(self.cli_path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._commands is not None and stat_key == self._cli_stat:
+            return self._commands
+        commands = self._load_commands()
+        self._cli_stat = stat_key
+        self._commands = commands
+        return commands
+
+    def _load_commands(self) -> List[DiscoveredCommand]:
+        with open(self.cli_path, "rb") as f:
+            raw = f.read()
+        # Parsing the CLI module is the slow part; reuse results while the source is unchanged
+        cache_path = self._cache_path(raw)
+        if cache_path:
+            cached = _read_cache(cache_path)
+            if cached is not None:
+                return cached
+        commands = self._analyze_source(raw.decode("utf-8"))
+        if cache_path:
+            _write_cache(cache_path, commands)
+        return commands
+
+    def _analyze_source(self, src: str) -> List[DiscoveredCommand]:
         tree = ast.parse(src)
         commands: List[DiscoveredCommand] = []
 
@@ -35,11 +155,15 @@ class SourceCodeAnalyzer:
                 if not cmd_name:
                     continue
                 params: List[Parameter] = []
+                # Defaults align to the last N positional args; map them once per function
+                pos_args = [a.arg for a in node.args.args]
+                defaults = node.args.defaults or []
+                default_map: Dict[str, ast.expr] = dict(zip(pos_args[len(pos_args) - len(defaults):], defaults))
                 for arg in node.args.args:
                     if arg.arg == "ctx":
                         # Typer context parameter
                         continue
-                    pinf = self._parse_param_for(node, arg)
+                    pinf = self._parse_param_for(arg, default_map)
                     if pinf:
                         params.append(
                             Parameter(
@@ -48,7 +172,11 @@ class SourceCodeAnalyzer:
                                 default=pinf.default, help=pinf.help_text, flags=pinf.flags,
                             )
                         )
-                help_text = ast.get_docstring(node)
+                # Only commands that actually start with a string literal pay for get_docstring's cleanup
+                first = node.body[0] if node.body else None
+                help_text = None
+                if type(first) is _Expr and type(first.value) is _Constant and type(first.value.value) is str:
+                    help_text = ast.get_docstring(node)
                 commands.append(
                     DiscoveredCommand(
                         name=cmd_name,
@@ -65,27 +193,35 @@ class SourceCodeAnalyzer:
     def _extract_command_name(self, fn: ast.FunctionDef) -> Optional[str]:
         # Look for @app.command(...)
         for deco in fn.decorator_list:
-            if isinstance(deco, ast.Call) and isinstance(deco.func, ast.Attribute):
-                if deco.func.attr == "command" and isinstance(deco.func.value, ast.Name) and deco.func.value.id == "app":
+            if type(deco) is not _Call:
+                continue
+            func = deco.func
+            if type(func) is _Attribute:
+                owner = func.value
+                if func.attr == "command" and type(owner) is _Name and owner.id == "app":
                     # name kwarg if provided
-                    for kw in deco.keywords or []:
+                    for kw in deco.keywords:
                         if kw.arg == "name":
-                            try:
-                                if isinstance(kw.value, ast.Constant) and isinstance(kw.value.value, str):
-                                    return kw.value.value
-                            except Exception:
-                                pass
+                            val = kw.value
+                            if type(val) is _Constant and type(val.value) is str:
+                                return val.value
                     # default: function name with underscores converted to dashes
                     return fn.name.replace("_", "-")
-            if isinstance(deco, ast.Call) and isinstance(deco.func, ast.Name) and deco.func.id == "app":
-                # uncommon, skip
-                continue
+            # bare @app(...) calls are uncommon, skip
         # Also include callback (top-level, not a command)
         return None
 
     def _annotation_to_type(self, ann: Optional[ast.expr]) -> str:
         if ann is None:
             return "string"
+        # CLI signatures repeat the same few annotations, so resolve each shape once
+        key = ast.dump(ann)
+        cached = self._ann_cache.get(key)
+        if cached is None:
+            cached = self._ann_cache[key] = self._resolve_annotation(ann)
+        return cached
+
+    def _resolve_annotation(self, ann: ast.expr) -> str:
         try:
             if isinstance(ann, ast.Subscript) and isinstance(ann.value, ast.Name) and ann.value.id in ("List", "list"):
                 elt = ann.slice
@@ -103,7 +239,7 @@ class SourceCodeAnalyzer:
             pass
         return "string"
 
-    def _parse_param_for(self, fn: ast.FunctionDef, arg: ast.arg) -> Optional[_ParamInfo]:
+    def _parse_param_for(self, arg: ast.arg, default_map: Dict[str, ast.expr]) -> Optional[_ParamInfo]:
         name = arg.arg
         type_str = self._annotation_to_type(arg.annotation)
         default = None
@@ -112,16 +248,6 @@ class SourceCodeAnalyzer:
         help_text: Optional[str] = None
         flags: List[str] = []
 
-        # Find default via function defaults
-        # Map arg position to default
-        pos_args = [a.arg for a in fn.args.args]
-        defaults = fn.args.defaults or []
-        default_map: Dict[str, ast.expr] = {}
-        if defaults:
-            # Defaults align to last N positional args
-            for idx, d in enumerate(defaults, start=len(pos_args) - len(defaults)):
-                default_map[pos_args[idx]] = d
-
         if name not in default_map:
             # No default => required argument
             required = True
@@ -136,21 +262,28 @@ class SourceCodeAnalyzer:
                     kind = "argument"
                     # First arg can be Ellipsis (required)
                     if dnode.args:
-                        if isinstance(dnode.args[0], ast.Name) and dnode.args[0].id == "Ellipsis":
+                        first = dnode.args[0]
+                        if (isinstance(first, ast.Constant) and first.value is Ellipsis) or (
+                            isinstance(first, ast.Name) and first.id == "Ellipsis"
+                        ):
                             required = True
                             default = None
-                        elif isinstance(dnode.args[0], ast.Constant):
-                            default = dnode.args[0].value
+                        elif isinstance(first, ast.Constant):
+                            default = first.value
                     for kw in dnode.keywords or []:
                         if kw.arg == "help" and isinstance(kw.value, ast.Constant):
                             help_text = str(kw.value.value)
                 elif callee == "Option":
                     kind = "option"
-                    # First arg is default value
+                    # First arg is default value; Ellipsis marks a required option
+                    required = False
                     if dnode.args:
-                        if isinstance(dnode.args[0], ast.Constant):
-                            default = dnode.args[0].value
-                        elif isinstance(dnode.args[0], ast.Name) and dnode.args[0].id == "None":
+                        first = dnode.args[0]
+                        if isinstance(first, ast.Constant) and first.value is Ellipsis:
+                            required = True
+                        elif isinstance(first, ast.Constant):
+                            default = first.value
+                        elif isinstance(first, ast.Name) and first.id == "None":
                             default = None
                     for a in dnode.args[1:]:
                         if isinstance(a, ast.Constant) and isinstance(a.value, str) and a.value.startswith("-"):
@@ -158,7 +291,6 @@ class SourceCodeAnalyzer:
                     for kw in dnode.keywords or []:
                         if kw.arg == "help" and isinstance(kw.value, ast.Constant):
                             help_text = str(kw.value.value)
-                    required = False
                 else:
                     # treat as plain default
                     pass
@@ -15,41 +15,28 @@ class CommandExecutor:
 
     def build_cli_args(self, command: DiscoveredCommand, param_values: Dict[str, Any]) -> List[str]:
         args: List[str] = ["-m", "bac_hunter.cli", command.name]
-        # Build mapping name->Parameter
-        param_index = {p.name: p for p in command.parameters}
-        # Maintain original declaration order
-        for p in command.parameters:
-            if p.kind == "argument":
-                if p.name in param_values:
-                    v = param_values[p.name]
-                    if isinstance(v, list):
-                        args.extend([str(x) for x in v])
-                    else:
-                        args.append(str(v))
-                elif p.required and p.default is None:
-                    raise ValueError(f"Missing required argument: {p.name}")
-        # Options next
-        for p in command.parameters:
-            if p.kind != "option":
-                continue
+        for p in command.arg_params:
+            if p.name in param_values:
+                v = param_values[p.name]
+                if isinstance(v, list):
+                    args.extend([str(x) for x in v])
+                else:
+                    args.append(str(v))
+            elif p.required and p.default is None:
+                raise ValueError(f"Missing required argument: {p.name}")
+        # Options next; only those explicitly provided are passed
+        for p in command.opt_params:
             if p.name not in param_values:
-                # Only include if boolean with default True and requested to flip? skip unless provided
                 continue
             v = param_values[p.name]
-            opt = f"--{p.name.replace('_','-')}"
             # Handle booleans as --flag/--no-flag
             if isinstance(v, bool):
-                if v:
-                    args.append(opt)
-                else:
-                    args.append(f"--no-{p.name.replace('_','-')}")
+                args.append(p.long_flag if v else p.no_flag)
             elif isinstance(v, list):
                 # Join by comma for list options
-                args.append(opt)
-                args.append(",".join([str(x) for x in v]))
+                args.extend((p.long_flag, ",".join([str(x) for x in v])))
             else:
-                args.append(opt)
-                args.append(str(v))
+                args.extend((p.long_flag, str(v)))
         return args
 
     async def run_stream(self, command: DiscoveredCommand, params: Dict[str, Any]) -> Tuple[str, asyncio.subprocess.Process]:
@@ -58,7 +45,7 @@ class CommandExecutor:
         proc = await asyncio.create_subprocess_exec(
             self.python, *args,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
         return run_id, proc
 
@@ -67,7 +54,8 @@ class CommandExecutor:
         proc = await asyncio.create_subprocess_exec(
             self.python, *args,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
-        out, err = await proc.communicate()
-        return proc.returncode or 0, (out or b"").decode(), (err or b"").decode()
\ No newline at end of file
+        out, _ = await proc.communicate()
+        # stderr is merged into stdout, so the error stream is always empty
+        return proc.returncode or 0, (out or b"").decode(), ""
\ No newline at end of file
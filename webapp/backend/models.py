@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Literal
 from pydantic import BaseModel, Field
 
@@ -12,6 +13,16 @@ class Parameter(BaseModel):
     help: Optional[str] = None
     flags: List[str] = Field(default_factory=list)
 
+    # CLI spellings, derived from name on first use; not fields, so they are
+    # neither serialized nor settable from input
+    @cached_property
+    def long_flag(self) -> str:
+        return "--" + self.name.replace("_", "-")
+
+    @cached_property
+    def no_flag(self) -> str:
+        return "--no-" + self.name.replace("_", "-")
+
 
 class DiscoveredCommand(BaseModel):
     name: str
@@ -22,6 +33,15 @@ class DiscoveredCommand(BaseModel):
     dependencies: List[str] = Field(default_factory=list)
     output_format: Optional[str] = None
 
+    # Positional arguments and options in declaration order, split once per command
+    @cached_property
+    def arg_params(self) -> List[Parameter]:
+        return [p for p in self.parameters if p.kind == "argument"]
+
+    @cached_property
+    def opt_params(self) -> List[Parameter]:
+        return [p for p in self.parameters if p.kind == "option"]
+
 
 class ExecuteRequest(BaseModel):
     parameters: Dict[str, Any] = Field(default_factory=dict)
@@ -1,36 +1,192 @@
 from __future__ import annotations
 import asyncio
+import bisect
+import os
 import time
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, List, Optional
 
 from models import RunStatus
 
 
+def _default_log_dir() -> str:
+    base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "bac_hunter", "run-logs")
+
+
 class RunManager:
-    def __init__(self):
+    """Tracks executed runs and their output.
+
+    Every byte is written to ``<log_dir>/<run_id>.log``; only about the last
+    ``max_memory_bytes`` stay in memory as a list of appended chunks
+    (``_chunks``) with their cumulative absolute end offsets (``_ends``), so
+    appends never move existing bytes and reads bisect to the first chunk.
+    ``_base_offset`` is where the in-memory tail starts; older ranges are read
+    back from the file. Writes are buffered and only flushed when chunks leave
+    the in-memory window or a spilled range is read. If the log file cannot be
+    created the run is kept fully in memory.
+
+    At most ``max_runs`` runs are kept: creating a run evicts the oldest
+    finished ones, deleting their logs, and ``remove_all`` clears the rest on
+    shutdown.
+
+    All methods are synchronous and called from the event loop thread, so an
+    append (chunk, end offset and ``last_log_offset``) is never observed half
+    done by a reader; no per-run lock is needed as long as that holds.
+    """
+
+    def __init__(self, log_dir: Optional[str] = None, max_memory_bytes: int = 4 * 1024 * 1024,
+                 max_runs: Optional[int] = None):
+        self.log_dir = log_dir or os.getenv("BH_WEB_LOG_DIR") or _default_log_dir()
+        self.max_memory_bytes = max_memory_bytes
+        self.max_runs = max_runs or int(os.getenv("BH_WEB_MAX_RUNS", "100"))
         self._runs: Dict[str, RunStatus] = {}
-        self._buffers: Dict[str, bytearray] = {}
+        self._chunks: Dict[str, List[bytes]] = {}
+        self._ends: Dict[str, List[int]] = {}
+        self._base_offset: Dict[str, int] = {}
+        self._files: Dict[str, BinaryIO] = {}
+        self._paths: Dict[str, str] = {}
         self._tasks: Dict[str, asyncio.Task] = {}
+        self._events: Dict[str, asyncio.Event] = {}
 
     def create(self, run_id: str, command: str, args: list[str]) -> RunStatus:
         rs = RunStatus(id=run_id, command=command, args=args, status="pending", started_at=time.time())
         self._runs[run_id] = rs
-        self._buffers[run_id] = bytearray()
+        self._chunks[run_id] = []
+        self._ends[run_id] = []
+        self._base_offset[run_id] = 0
+        self._events[run_id] = asyncio.Event()
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            path = os.path.join(self.log_dir, f"{run_id}.log")
+            self._files[run_id] = open(path, "w+b")
+            self._paths[run_id] = path
+        except OSError:
+            pass
+        self._evict_finished()
         return rs
 
+    def _evict_finished(self):
+        """Remove the oldest finished runs beyond ``max_runs``; active runs are never evicted."""
+        excess = len(self._runs) - self.max_runs
+        if excess <= 0:
+            return
+        finished = [rid for rid, r in self._runs.items() if r.status in ("completed", "failed")]
+        for rid in finished[:excess]:
+            self.remove(rid)
+
     def get(self, run_id: str) -> Optional[RunStatus]:
         return self._runs.get(run_id)
 
+    def get_event(self, run_id: str) -> Optional[asyncio.Event]:
+        return self._events.get(run_id)
+
+    def _notify(self, run_id: str):
+        ev = self._events.get(run_id)
+        if ev:
+            ev.set()
+
     def append(self, run_id: str, data: bytes):
-        if run_id in self._buffers:
-            self._buffers[run_id].extend(data)
+        if run_id in self._chunks and data:
+            chunks = self._chunks[run_id]
+            ends = self._ends[run_id]
+            f = self._files.get(run_id)
+            if f is not None:
+                try:
+                    # Buffered; flushed below when chunks leave memory, and before spilled reads
+                    f.write(data)
+                except OSError:
+                    # Stop spilling; keep everything in memory from here on
+                    self._close_file(run_id)
+                    f = None
+            total = (ends[-1] if ends else self._base_offset[run_id]) + len(data)
+            chunks.append(bytes(data))
+            ends.append(total)
+            # Drop whole chunks that fall outside the window, with some slack so this is occasional
+            if f is not None and total - self._base_offset[run_id] > self.max_memory_bytes + self.max_memory_bytes // 4:
+                drop = bisect.bisect_right(ends, total - self.max_memory_bytes)
+                if drop and self._flush(run_id, f):
+                    self._base_offset[run_id] = ends[drop - 1]
+                    del chunks[:drop]
+                    del ends[:drop]
             r = self._runs.get(run_id)
             if r:
-                r.last_log_offset = len(self._buffers[run_id])
+                r.last_log_offset = total
+            self._notify(run_id)
+
+    def size(self, run_id: str) -> int:
+        ends = self._ends.get(run_id)
+        if ends is None:
+            return 0
+        return ends[-1] if ends else self._base_offset[run_id]
+
+    def read_from(self, run_id: str, offset: int, max_bytes: int = 65536) -> bytes:
+        chunks = self._chunks.get(run_id)
+        if chunks is None:
+            return b""
+        ends = self._ends[run_id]
+        base = self._base_offset[run_id]
+        end = min(self.size(run_id), offset + max_bytes)
+        if offset >= end:
+            return b""
+        if offset < base:
+            return self._read_spilled(run_id, offset, end - offset)
+        i = bisect.bisect_right(ends, offset)
+        parts = []
+        pos = offset
+        while pos < end:
+            chunk = chunks[i]
+            start = ends[i] - len(chunk)
+            parts.append(chunk[pos - start:min(end, ends[i]) - start])
+            pos = ends[i]
+            i += 1
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def _flush(self, run_id: str, f: BinaryIO) -> bool:
+        """Flush buffered log bytes to disk; on failure stop spilling and keep the run in memory."""
+        try:
+            f.flush()
+            return True
+        except OSError:
+            self._close_file(run_id)
+            return False
+
+    def _read_spilled(self, run_id: str, offset: int, length: int) -> bytes:
+        f = self._files.get(run_id)
+        try:
+            if f is not None:
+                f.flush()
+            if f is not None and hasattr(os, "pread"):
+                return os.pread(f.fileno(), length, offset)
+            with open(self._paths[run_id], "rb") as rf:
+                rf.seek(offset)
+                return rf.read(length)
+        except (OSError, KeyError):
+            return b""
+
+    def _close_file(self, run_id: str):
+        f = self._files.pop(run_id, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def remove(self, run_id: str):
+        """Forget a run and delete its spilled log file."""
+        self._close_file(run_id)
+        path = self._paths.pop(run_id, None)
+        for store in (self._runs, self._chunks, self._ends, self._base_offset, self._tasks, self._events):
+            store.pop(run_id, None)
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
-    def read_from(self, run_id: str, offset: int) -> bytes:
-        buf = self._buffers.get(run_id, bytearray())
-        return bytes(buf[offset:])
+    def remove_all(self):
+        """Forget every run and delete their log files (on shutdown)."""
+        for run_id in list(self._runs):
+            self.remove(run_id)
 
     def set_task(self, run_id: str, task: asyncio.Task):
         self._tasks[run_id] = task
@@ -41,6 +197,10 @@ class RunManager:
             rs.status = "completed" if rc == 0 else "failed"
             rs.return_code = rc
             rs.ended_at = time.time()
+            self._tasks.pop(run_id, None)
+            # Output is complete; spilled ranges are served by reopening the log file
+            self._close_file(run_id)
+            self._notify(run_id)
 
 
 run_manager = RunManager()
\ No newline at end of file